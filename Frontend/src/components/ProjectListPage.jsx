@@ -5,12 +5,20 @@ import ProjectCard from '../components/ProjectCard';
 export default function ProjectListPage() {
   const [projects, setProjects] = useState([]);
   const [loading, setLoading] = useState(true);
+  // Cursor of the next page (X-Next-Cursor header); null on the last page
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const fetchPage = async (cursor) => {
+    const res = await axios.get('/projects', { params: cursor ? { cursor } : {} });
+    setProjects(prev => (cursor ? [...prev, ...res.data] : res.data));
+    setNextCursor(res.headers['x-next-cursor'] || null);
+  };
 
   useEffect(() => {
     const fetchProjects = async () => {
       try {
-        const res = await axios.get('/projects');
-        setProjects(res.data);
+        await fetchPage(null);
       } catch (err) {
         console.error('Failed to fetch projects', err);
       } finally {
@@ -20,6 +28,17 @@ export default function ProjectListPage() {
     fetchProjects();
   }, []);
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      await fetchPage(nextCursor);
+    } catch (err) {
+      console.error('Failed to fetch more projects', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (loading) return <div className="container mx-auto py-8 px-4">Loading projects...</div>;
 
   return (
@@ -28,6 +47,13 @@ export default function ProjectListPage() {
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
         {projects.length === 0 ? <p>No open projects found.</p> : projects.map(p => <ProjectCard key={p.id} project={p} />)}
       </div>
+      {nextCursor && (
+        <div className="mt-8 text-center">
+          <button onClick={loadMore} disabled={loadingMore} className="px-6 py-2 bg-indigo-600 text-white rounded">
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
@@ -38,6 +38,34 @@ export default function UserProfilePage() {
     // eslint-disable-next-line
   }, [id]);
 
+  // Next pages of the profile lists (cursors come with the profile)
+  const loadMoreReviews = async () => {
+    try {
+      const res = await axios.get(`/user/${id}/reviews`, { params: { cursor: profile.reviews_next_cursor } });
+      setProfile(prev => ({
+        ...prev,
+        reviews_received: [...prev.reviews_received, ...res.data],
+        reviews_next_cursor: res.headers['x-next-cursor'] || null,
+      }));
+    } catch (err) {
+      console.error('Error fetching reviews:', err);
+    }
+  };
+
+  const loadMoreProjects = async () => {
+    const key = profile.is_freelancer ? 'accepted_projects' : 'posted_projects';
+    try {
+      const res = await axios.get(`/user/${id}/projects`, { params: { cursor: profile.projects_next_cursor } });
+      setProfile(prev => ({
+        ...prev,
+        [key]: [...prev[key], ...res.data],
+        projects_next_cursor: res.headers['x-next-cursor'] || null,
+      }));
+    } catch (err) {
+      console.error('Error fetching projects:', err);
+    }
+  };
+
   const handleEditSubmit = async (e) => {
     e.preventDefault();
     try {
@@ -177,6 +205,11 @@ export default function UserProfilePage() {
             ) : (
               <p>This client has not posted any projects yet.</p>
             )}
+            {profile.projects_next_cursor && (
+              <button onClick={loadMoreProjects} className="px-3 py-1 border rounded bg-white hover:bg-gray-50 transition-colors">
+                Load more
+              </button>
+            )}
           </div>
         </div>
       )}
@@ -261,6 +294,11 @@ export default function UserProfilePage() {
             ) : (
               <p>This freelancer has no accepted projects yet.</p>
             )}
+            {profile.projects_next_cursor && (
+              <button onClick={loadMoreProjects} className="px-3 py-1 border rounded bg-white hover:bg-gray-50 transition-colors">
+                Load more
+              </button>
+            )}
           </div>
         </div>
       )}
@@ -281,6 +319,11 @@ export default function UserProfilePage() {
           ) : (
             <p>No reviews received yet.</p>
           )}
+          {profile.reviews_next_cursor && (
+            <button onClick={loadMoreReviews} className="px-3 py-1 border rounded bg-white hover:bg-gray-50 transition-colors">
+              Load more
+            </button>
+          )}
         </div>
       </div>
     </div>
@@ -4,12 +4,25 @@ from flask_marshmallow import Marshmallow
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from config import Config
+from app.cache import ConfiguredCache
+from app.ranking_jobs import RankingJobs
+from app.response_cache import ResponseCache
 
 # Initialize extensions
 db = SQLAlchemy()
 ma = Marshmallow()
 jwt = JWTManager()
 cors = CORS()
+# Ranking results keyed by (project_id, priority, ranking_version)
+ranking_cache = ConfiguredCache('ranking', 'RANKING_CACHE_BACKEND', size_key='RANKING_CACHE_SIZE')
+# Freelancer.com rating lookups keyed by ("freelancer", username)
+external_cache = ConfiguredCache(
+    'external', 'EXTERNAL_CACHE_BACKEND', size_key='EXTERNAL_CACHE_SIZE', ttl_key='EXTERNAL_CACHE_TTL'
+)
+# Background ranking jobs for very large projects
+ranking_jobs = RankingJobs()
+# Rendered responses of the public read endpoints
+response_cache = ResponseCache()
 
 def create_app(config_class=Config):
     """
@@ -23,9 +36,14 @@ def create_app(config_class=Config):
     db.init_app(app)
     ma.init_app(app)
     jwt.init_app(app)
+    ranking_cache.init_app(app)
+    external_cache.init_app(app)
+    ranking_jobs.init_app(app)
+    response_cache.init_app(app)
     # Enable CORS for the React frontend
 # Allow any origin during development
-    cors.init_app(app, resources={r"/api/*": {"origins": "*"}})
+    # (X-Next-Cursor carries the next page of cursor-paginated lists)
+    cors.init_app(app, resources={r"/api/*": {"origins": "*"}}, expose_headers=["X-Next-Cursor"])
 
     # Import and register blueprints
     from app.routes import api_bp
@@ -39,4 +57,30 @@ def create_app(config_class=Config):
             db.create_all()
         print("Initialized the database.")
 
+    # Add new tables/columns/indexes to an existing database
+    @app.cli.command("upgrade-db")
+    def upgrade_db_command():
+        from app.migrations import upgrade_database
+        with app.app_context():
+            applied = upgrade_database()
+        for change in applied:
+            print(change)
+        print("Database is up to date.")
+
+    # Recompute the skill bitsets of every user and project
+    @app.cli.command("reindex-skills")
+    def reindex_skills_command():
+        from app.skills import reindex_all_skills
+        with app.app_context():
+            reindex_all_skills()
+        print("Reindexed skills.")
+
+    # Recompute every freelancer's rating aggregates from the review table
+    @app.cli.command("rebuild-ratings")
+    def rebuild_ratings_command():
+        from app.ratings import rebuild_rating_aggregates
+        with app.app_context():
+            count = rebuild_rating_aggregates()
+        print(f"Rebuilt rating aggregates for {count} reviewed freelancers.")
+
     return app
\ No newline at end of file
@@ -0,0 +1,60 @@
+# Bid listing for GET /api/project/<id>/bids.
+# Bids of one project come in keyset pages (app/pagination.py) in one of
+# three orders, each answered by its own (project_id, sort key, id) index,
+# so a project with thousands of bids is browsed a page at a time without
+# loading the rest. The cursor names the order it belongs to, so a cursor
+# cannot be replayed against a different sort.
+
+from datetime import datetime
+
+from sqlalchemy.orm import selectinload
+
+from app import db
+from app.models import Bid, BID_TIMELINE_KEY
+from app.pagination import decode_cursor, encode_cursor, keyset_page
+
+BID_PAGE_SIZE = 20
+MAX_BID_PAGE_SIZE = 100
+
+NO_TIMELINE = 2147483647  # matches the literal in BID_TIMELINE_KEY
+
+
+def _timeline_key(bid):
+    days = bid.proposed_timeline_days
+    return (NO_TIMELINE if days is None else days, bid.id)
+
+
+# sort name -> (key columns, descending, cursor value types, key of a row)
+BID_SORTS = {
+    "newest": ((Bid.created_at, Bid.id), True, (datetime.fromisoformat, int), None),
+    "amount": ((Bid.amount, Bid.id), False, (float, int), None),
+    "timeline": ((BID_TIMELINE_KEY, Bid.id), False, (int, int), _timeline_key),
+}
+
+
+def decode_bid_cursor(sort, cursor):
+    """The sort key in a cursor of `sort`; raises ValueError otherwise."""
+    _, _, types, _ = BID_SORTS[sort]
+    values = decode_cursor(cursor, str, *types)
+    if values[0] != sort:
+        raise ValueError("Invalid cursor")
+    return values[1:]
+
+
+def encode_bid_cursor(sort, key):
+    return encode_cursor(sort, *key)
+
+
+def project_bids_page(project_id, sort="newest", after=None, limit=BID_PAGE_SIZE):
+    """
+    One page of the project's bids in `sort` order (newest first, lowest
+    amount first or shortest timeline first) with their freelancer
+    loaded. Returns (bids, next_key).
+    """
+    columns, descending, _, row_key = BID_SORTS[sort]
+    query = (
+        db.select(Bid)
+        .where(Bid.project_id == project_id)
+        .options(selectinload(Bid.freelancer))
+    )
+    return keyset_page(query, columns, after, limit, descending=descending, row_key=row_key)
@@ -0,0 +1,197 @@
+# Bulk ingestion of projects and bids (POST /api/projects/bulk and
+# /api/bids/bulk), for migrations and integrations that create hundreds of
+# items at once.
+# A batch is validated in one pass: field checks per item, then every
+# lookup the single-item routes do per request (project status, existing
+# bid) as one set query over the whole batch. Valid
+# items are inserted with multi-row INSERTs in a single transaction;
+# invalid ones are reported by index and do not stop the rest.
+# Ranking states of the projects that got bids are marked stale once per
+# project (rebuilt on their next read) instead of being updated bid by bid.
+
+from collections import defaultdict
+
+from app import db
+from app.models import Project, Bid, ProjectSkill
+from app.ranking_data import bump_ranking_versions
+from app.skills import (
+    intern_skills,
+    parse_skills,
+    skill_idf,
+    skill_ids_to_bits,
+    skill_vector,
+    vectors_enabled,
+)
+
+
+def _number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_text(item, key, errors, max_length=None):
+    value = item.get(key)
+    if not isinstance(value, str) or not value.strip():
+        errors[key] = "Required"
+    elif max_length and len(value) > max_length:
+        errors[key] = f"At most {max_length} characters"
+
+
+def _check_id(item, key, errors, required=True):
+    value = item.get(key)
+    if value is None and not required:
+        return
+    if not isinstance(value, int) or isinstance(value, bool):
+        errors[key] = "Must be an integer id"
+
+
+def _insert(model, rows, key):
+    """
+    Multi-row INSERT of `rows`; returns their new ids in row order.
+    RETURNING order is unspecified (and asking for it makes SQLAlchemy
+    insert row by row on SQLite), so returned rows are matched back by the
+    `key` columns. Rows equal on all of them are interchangeable.
+    """
+    columns = [getattr(model, name) for name in key]
+    ids = defaultdict(list)
+    for new_id, *values in db.session.execute(db.insert(model).returning(model.id, *columns), rows):
+        ids[tuple(values)].append(new_id)
+    return [ids[tuple(row[name] for name in key)].pop() for row in rows]
+
+
+# --- Projects ---
+
+def _validate_project(item):
+    if not isinstance(item, dict):
+        return {"item": "Must be an object"}
+    errors = {}
+    _check_text(item, 'title', errors, max_length=Project.title.type.length)
+    _check_text(item, 'description', errors)
+    if not _number(item.get('budget')) or item['budget'] <= 0:
+        errors['budget'] = "Must be a positive number"
+    skills = item.get('required_skills')
+    if skills is not None and not isinstance(skills, str):
+        errors['required_skills'] = "Must be a comma-separated string"
+    return errors
+
+
+def ingest_projects(client, items):
+    """
+    Creates the valid items as open projects of `client`, with their skill
+    bitsets, vectors and project_skill entries. Runs in the caller's
+    transaction (the caller commits). Returns one result per item, in
+    order: {"index", "id"} or {"index", "errors"}.
+    """
+    results = [{"index": i, "errors": _validate_project(item)} for i, item in enumerate(items)]
+    valid = [(r, items[r["index"]]) for r in results if not r["errors"]]
+    if not valid:
+        return results
+
+    # Skills of the whole batch: one vocabulary lookup, one IDF query
+    skill_names = [parse_skills(item.get('required_skills')) for _, item in valid]
+    ids_by_name = intern_skills(sorted({n for names in skill_names for n in names}))
+    idf = skill_idf(list(ids_by_name.values())) if vectors_enabled() else None
+
+    rows = []
+    for (_, item), names in zip(valid, skill_names):
+        skill_ids = {ids_by_name[n] for n in names}
+        rows.append({
+            "title": item['title'].strip(),
+            "description": item['description'],
+            "budget": item['budget'],
+            "client_id": client.id,
+            "required_skills": item.get('required_skills'),
+            "skill_bits": skill_ids_to_bits(skill_ids),
+            "skill_count": len(skill_ids),
+            "skill_vector": None if idf is None else skill_vector(skill_ids, idf),
+        })
+
+    # Equal on these columns means equal skills too, so any id will do
+    project_ids = _insert(Project, rows, ("title", "description", "budget", "required_skills"))
+
+    links = [
+        {"skill_id": ids_by_name[n], "project_id": project_id, "is_open": True}
+        for project_id, names in zip(project_ids, skill_names)
+        for n in names
+    ]
+    if links:
+        db.session.execute(db.insert(ProjectSkill), links)
+
+    for (result, _), project_id in zip(valid, project_ids):
+        del result["errors"]
+        result["id"] = project_id
+    return results
+
+
+# --- Bids ---
+
+def _validate_bid(item):
+    if not isinstance(item, dict):
+        return {"item": "Must be an object"}
+    errors = {}
+    _check_id(item, 'project_id', errors)
+    _check_id(item, 'freelancer_id', errors, required=False)
+    if not _number(item.get('amount')) or item['amount'] <= 0:
+        errors['amount'] = "Must be a positive number"
+    _check_text(item, 'proposal', errors)
+    days = item.get('proposed_timeline_days')
+    if days is not None and (not isinstance(days, int) or isinstance(days, bool) or days <= 0):
+        errors['proposed_timeline_days'] = "Must be a positive integer"
+    return errors
+
+
+def ingest_bids(freelancer, items):
+    """
+    Places the valid items as bids of `freelancer` (the caller; an item may
+    omit freelancer_id, set it to null or repeat the caller's id, but cannot
+    name anyone else). Checks
+    project existence and status, existing bids and duplicates within the
+    batch with one query each. Runs in the caller's transaction (the caller
+    commits). Returns (results, project_ids_with_new_bids).
+    """
+    results = [{"index": i, "errors": _validate_bid(item)} for i, item in enumerate(items)]
+    valid = [(r, items[r["index"]]) for r in results if not r["errors"]]
+
+    project_ids = {item['project_id'] for _, item in valid}
+    projects = dict(db.session.execute(
+        db.select(Project.id, Project.status).where(Project.id.in_(project_ids))
+    ).all()) if project_ids else {}
+    existing = set(db.session.execute(
+        db.select(Bid.project_id)
+        .where(Bid.project_id.in_(project_ids), Bid.freelancer_id == freelancer.id)
+    ).scalars()) if project_ids else set()
+
+    rows, accepted, first_index = [], [], {}
+    for result, item in valid:
+        project_id = item['project_id']
+        if item.get('freelancer_id') not in (None, freelancer.id):
+            result["errors"] = {"freelancer_id": "You can only place your own bids"}
+        elif project_id not in projects:
+            result["errors"] = {"project_id": "Project not found"}
+        elif projects[project_id] != 'open':
+            result["errors"] = {"project_id": "Project is not open for bidding"}
+        elif project_id in existing:
+            result["errors"] = {"project_id": "You have already placed a bid on this project"}
+        elif project_id in first_index:
+            result["errors"] = {"project_id": f"Duplicate of item {first_index[project_id]}"}
+        else:
+            first_index[project_id] = result["index"]
+            accepted.append(result)
+            rows.append({
+                "amount": item['amount'],
+                "proposal": item['proposal'],
+                "proposed_timeline_days": item.get('proposed_timeline_days'),
+                "project_id": project_id,
+                "freelancer_id": freelancer.id,
+            })
+
+    if not rows:
+        return results, set()
+
+    bid_ids = _insert(Bid, rows, ("project_id", "freelancer_id"))
+    for result, bid_id in zip(accepted, bid_ids):
+        del result["errors"]
+        result["id"] = bid_id
+
+    touched = {row["project_id"] for row in rows}
+    bump_ranking_versions(touched)
+    return results, touched
@@ -0,0 +1,149 @@
+# In-process caches used by the API.
+
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with hit/miss counters.
+    Follows the Flask extension pattern: create it at import time and
+    call init_app() to read its size from the app config.
+    """
+
+    def __init__(self, maxsize=1024, config_key=None):
+        self.maxsize = maxsize
+        self.config_key = config_key
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def init_app(self, app):
+        if self.config_key:
+            self.maxsize = app.config.get(self.config_key, self.maxsize)
+        self.clear()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class TTLCache(LRUCache):
+    """
+    LRUCache whose entries also expire `ttl` seconds after they were set.
+    Expired entries count as misses (and in `expired`).
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, config_key=None):
+        super().__init__(maxsize, config_key)
+        self.ttl = ttl
+        self.expired = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                expires_at, value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.expired += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        super().set(key, (expires_at, value))
+
+    def clear(self):
+        super().clear()
+        self.expired = 0
+
+    def stats(self):
+        stats = super().stats()
+        stats.update(ttl=self.ttl, expired=self.expired)
+        return stats
+
+
+class ConfiguredCache:
+    """
+    Cache whose storage is picked from the app config at init_app:
+    "memory" (an LRUCache in this process, a TTLCache when `ttl_key` is
+    set) or "disk" (the `namespace` of the cache file shared by every
+    worker, app/disk_cache.py). Same get/set/delete/clear/stats interface.
+    """
+
+    def __init__(self, namespace, backend_key, size_key=None, ttl_key=None):
+        self.namespace = namespace
+        self.backend_key = backend_key
+        self.size_key = size_key
+        self.ttl_key = ttl_key
+        self.cache = LRUCache()
+
+    def init_app(self, app):
+        ttl = app.config.get(self.ttl_key) if self.ttl_key else None
+        if app.config.get(self.backend_key, 'memory') == 'disk':
+            from app.disk_cache import DiskCache, app_namespace, disk_store
+            self.cache = DiskCache(disk_store(app), app_namespace(app, self.namespace), ttl=ttl)
+            return
+        if ttl:
+            self.cache = TTLCache(ttl=ttl, config_key=self.size_key)
+        else:
+            self.cache = LRUCache(config_key=self.size_key)
+        self.cache.init_app(app)
+
+    def get(self, key, default=None):
+        return self.cache.get(key, default)
+
+    def set(self, key, value):
+        self.cache.set(key, value)
+
+    def delete(self, key):
+        self.cache.delete(key)
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self):
+        return self.cache.stats()
@@ -0,0 +1,94 @@
+# Conditional GET (ETag / Last-Modified) for the read endpoints.
+# Validators are computed from row versions, never from the response body:
+# Project, Bid, Review and User carry `updated_at` (set on every ORM or
+# bulk UPDATE), so a response changes exactly when one of the rows it shows
+# changes, is added or is deleted. The ETag is a hash of those versions
+# (weak, since it describes the data rather than the bytes). A matching
+# If-None-Match (or, without one, If-Modified-Since) gets a bodyless 304.
+
+import hashlib
+from collections import namedtuple
+
+from flask import make_response, request
+
+from app import db
+from app.models import User, Project, Bid, Review
+
+Validators = namedtuple("Validators", ["etag", "last_modified"])
+
+
+def make_validators(parts, timestamps):
+    """
+    Validators for a response identified by `parts` (anything with a
+    stable repr, e.g. ids, counts and versions); Last-Modified is the
+    newest of `timestamps` (None values are ignored).
+    """
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    known = [t for t in timestamps if t is not None]
+    return Validators(digest, max(known) if known else None)
+
+
+def project_graph_validators(project_ids, extra=()):
+    """
+    Validators for ProjectSchema output of these projects (client,
+    freelancer, bids with their freelancer, reviews with both users),
+    from one aggregate query that loads none of the rows. Returns None if
+    none of the projects exist.
+    """
+    ids = list(project_ids)
+    people = db.union(
+        db.select(Project.client_id).where(Project.id.in_(ids)),
+        db.select(Project.freelancer_id).where(Project.id.in_(ids)),
+        db.select(Bid.freelancer_id).where(Bid.project_id.in_(ids)),
+        db.select(Review.reviewer_id).where(Review.project_id.in_(ids)),
+        db.select(Review.reviewee_id).where(Review.project_id.in_(ids)),
+    )
+
+    def versions(model, owner):
+        # Row count catches deletions, the newest updated_at any other change
+        return (
+            db.select(db.func.count()).where(owner.in_(ids)).scalar_subquery(),
+            db.select(db.func.max(model.updated_at)).where(owner.in_(ids)).scalar_subquery(),
+        )
+
+    row = tuple(db.session.execute(db.select(
+        *versions(Project, Project.id),
+        *versions(Bid, Bid.project_id),
+        *versions(Review, Review.project_id),
+        db.select(db.func.max(User.updated_at)).where(User.id.in_(people)).scalar_subquery(),
+    )).one())
+    if not row[0]:
+        return None
+    return make_validators((ids, row, tuple(extra)), row[1::2] + (row[6],))
+
+
+def rows_validators(rows, extra=()):
+    """Validators for already-loaded rows (e.g. a profile page)."""
+    rows = [r for r in rows if r is not None]
+    parts = [(type(r).__name__, r.id, r.updated_at) for r in rows]
+    return make_validators((parts, tuple(extra)), [r.updated_at for r in rows])
+
+
+def not_modified(validators):
+    """A 304 response if the request already has this version, else None."""
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(validators.etag)
+    else:
+        # HTTP dates have whole-second resolution
+        since = request.if_modified_since
+        fresh = (since is not None and validators.last_modified is not None
+                 and validators.last_modified.replace(microsecond=0) <= since.replace(tzinfo=None))
+    if not fresh:
+        return None
+    return conditional(make_response("", 304), validators)
+
+
+def conditional(response, validators):
+    """Sets ETag/Last-Modified on `response` (a Flask response or return value)."""
+    response = make_response(response)
+    response.set_etag(validators.etag, weak=True)
+    if validators.last_modified is not None:
+        response.last_modified = validators.last_modified
+    # Let browsers keep the body but revalidate it on every use
+    response.cache_control.no_cache = True
+    return response
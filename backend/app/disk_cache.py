@@ -0,0 +1,284 @@
+# Cache shared by every worker process on a host.
+# Entries live in a separate SQLite file (DISK_CACHE_PATH, by default
+# instance/cache.sqlite3) in WAL mode, so any number of processes can read
+# while one writes, and warm entries survive restarts and deploys. Every
+# write is its own transaction, which also keeps a running byte total;
+# when the total passes DISK_CACHE_MAX_BYTES the least recently used
+# entries are evicted in the same transaction. Values are pickled.
+# The cache is best effort: a locked or unreadable file turns into a miss
+# (or a skipped write) and never fails a request.
+
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS cache_entry (
+        key TEXT PRIMARY KEY,
+        value BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        expires_at REAL,
+        accessed_at REAL NOT NULL,
+        evictable INTEGER NOT NULL DEFAULT 1
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_cache_entry_lru ON cache_entry (evictable, accessed_at)",
+    """
+    CREATE TABLE IF NOT EXISTS cache_meta (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        total_bytes INTEGER NOT NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO cache_meta (id, total_bytes) VALUES (1, 0)",
+]
+
+# Reads refresh accessed_at (a write) at most this often per entry
+ACCESS_SLACK = 30.0
+# Eviction frees space down to this fraction of the limit
+EVICT_TO = 0.9
+# Upper bound of a namespace's key range ("ns:" <= key < "ns:" + KEY_RANGE_END)
+KEY_RANGE_END = "\uffff"
+
+
+class DiskStore:
+    """
+    One cache file, opened lazily with a connection per thread (and per
+    process, so forked workers never share a connection).
+    """
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._local = threading.local()
+
+    def connection(self):
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def get(self, key):
+        """Returns (found, value)."""
+        conn = self.connection()
+        row = conn.execute(
+            "SELECT value, expires_at, accessed_at FROM cache_entry WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return False, None
+        value, expires_at, accessed_at = row
+        now = time.time()
+        if expires_at is not None and expires_at <= now:
+            self.delete(key)
+            return False, None
+        if now - accessed_at > ACCESS_SLACK:
+            try:
+                conn.execute("UPDATE cache_entry SET accessed_at = ? WHERE key = ?", (now, key))
+            except sqlite3.OperationalError:
+                pass  # busy writer: the LRU position can wait for the next read
+        return True, pickle.loads(value)
+
+    def get_many(self, keys):
+        """Returns {key: value} for the keys that are present and fresh."""
+        conn = self.connection()
+        now = time.time()
+        found = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = conn.execute(
+                f"SELECT key, value, expires_at FROM cache_entry WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for key, value, expires_at in rows:
+                if expires_at is None or expires_at > now:
+                    found[key] = pickle.loads(value)
+        return found
+
+    def set(self, key, value, ttl=None, evictable=True):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        size = len(blob) + len(key)
+        now = time.time()
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            old = conn.execute("SELECT size FROM cache_entry WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entry (key, value, size, expires_at, accessed_at, evictable) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, blob, size, now + ttl if ttl else None, now, int(evictable)),
+            )
+            total = self._add_bytes(conn, size - (old[0] if old else 0))
+            if total > self.max_bytes:
+                self._evict(conn, total, now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, key):
+        self.delete_where("key = ?", (key,))
+
+    def delete_where(self, condition, params=()):
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            freed = conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM cache_entry WHERE {condition}", params
+            ).fetchone()[0]
+            conn.execute(f"DELETE FROM cache_entry WHERE {condition}", params)
+            self._add_bytes(conn, -freed)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _add_bytes(self, conn, delta):
+        conn.execute("UPDATE cache_meta SET total_bytes = MAX(total_bytes + ?, 0) WHERE id = 1", (delta,))
+        return conn.execute("SELECT total_bytes FROM cache_meta WHERE id = 1").fetchone()[0]
+
+    def _evict(self, conn, total, now):
+        # Expired entries go first, then the least recently used ones
+        total -= conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entry WHERE expires_at <= ?", (now,)
+        ).fetchone()[0]
+        conn.execute("DELETE FROM cache_entry WHERE expires_at <= ?", (now,))
+
+        target = self.max_bytes * EVICT_TO
+        victims = []
+        rows = conn.execute("SELECT key, size FROM cache_entry WHERE evictable = 1 ORDER BY accessed_at")
+        for key, size in rows:
+            if total <= target:
+                break
+            victims.append((key,))
+            total -= size
+        rows.close()
+        conn.executemany("DELETE FROM cache_entry WHERE key = ?", victims)
+        conn.execute("UPDATE cache_meta SET total_bytes = ? WHERE id = 1", (max(total, 0),))
+        self.evictions += len(victims)
+
+    def stats(self, prefix):
+        conn = self.connection()
+        count, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entry WHERE key >= ? AND key < ?",
+            (prefix, prefix + KEY_RANGE_END),
+        ).fetchone()
+        total = conn.execute("SELECT total_bytes FROM cache_meta WHERE id = 1").fetchone()[0]
+        return {"entries": count, "bytes": size, "file_bytes": total, "max_bytes": self.max_bytes,
+                "evictions": self.evictions, "path": self.path}
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def disk_store(app):
+    """The DiskStore of the app's DISK_CACHE_PATH (one per file per process)."""
+    path = app.config.get('DISK_CACHE_PATH') or os.path.join(app.instance_path, 'cache.sqlite3')
+    max_bytes = app.config.get('DISK_CACHE_MAX_BYTES', 256 * 1024 * 1024)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = DiskStore(path, max_bytes)
+        store.max_bytes = max_bytes
+        return store
+
+
+def app_namespace(app, name):
+    """
+    `name` scoped to the app's database, so apps on different databases
+    can share a cache file without reading each other's entries.
+    """
+    uri = str(app.config.get('SQLALCHEMY_DATABASE_URI'))
+    return f"{name}@{hashlib.sha1(uri.encode()).hexdigest()[:8]}"
+
+
+class DiskCache:
+    """
+    A namespace of the shared disk cache with the LRUCache interface
+    (get/set/delete/clear/stats). Keys may be any value with a stable repr
+    (strings, numbers, tuples of them).
+    """
+
+    def __init__(self, store, namespace, ttl=None):
+        self.store = store
+        self.namespace = namespace
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def _key(self, key):
+        return f"{self.namespace}:{key!r}"
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _failed(self, action):
+        self._count("errors")
+        log.warning("Disk cache %s failed (%s)", action, self.store.path, exc_info=True)
+
+    def get(self, key, default=None):
+        try:
+            found, value = self.store.get(self._key(key))
+        except (sqlite3.Error, OSError, pickle.UnpicklingError):
+            self._failed("read")
+            found = False
+        self._count("hits" if found else "misses")
+        return value if found else default
+
+    def get_many(self, keys):
+        """Returns {key: value} for the given keys that are cached."""
+        keys = list(keys)
+        try:
+            found = self.store.get_many([self._key(key) for key in keys])
+        except (sqlite3.Error, OSError, pickle.UnpicklingError):
+            self._failed("read")
+            return {}
+        return {key: found[self._key(key)] for key in keys if self._key(key) in found}
+
+    def set(self, key, value, ttl=None, evictable=True):
+        try:
+            self.store.set(self._key(key), value, ttl if ttl is not None else self.ttl, evictable)
+        except (sqlite3.Error, OSError, pickle.PicklingError):
+            self._failed("write")
+
+    def delete(self, key):
+        try:
+            self.store.delete(self._key(key))
+        except sqlite3.Error:
+            self._failed("delete")
+
+    def clear(self):
+        prefix = f"{self.namespace}:"
+        try:
+            self.store.delete_where("key >= ? AND key < ?", (prefix, prefix + KEY_RANGE_END))
+        except sqlite3.Error:
+            self._failed("clear")
+        with self._lock:
+            self.hits = self.misses = self.errors = 0
+
+    def stats(self):
+        try:
+            stats = self.store.stats(f"{self.namespace}:")
+        except sqlite3.Error:
+            self._failed("stats")
+            stats = {}
+        with self._lock:
+            stats.update(backend="disk", hits=self.hits, misses=self.misses,
+                         errors=self.errors, ttl=self.ttl)
+        return stats
@@ -0,0 +1,58 @@
+# Sparse fieldsets for the read endpoints.
+# ?fields=a,b picks the top-level attributes of the response and
+# ?include=x,y the nested relations. Routes load only the columns and
+# relations a fieldset needs, so leaving out e.g. bids also skips the
+# queries that would load them.
+
+from collections import namedtuple
+from functools import lru_cache
+
+from flask import request
+
+Fieldset = namedtuple("Fieldset", ["fields", "includes"])
+
+PROJECT_FIELDS = (
+    "id", "title", "description", "budget", "status", "created_at",
+    "required_skills", "accepted_bid_id",
+)
+PROJECT_INCLUDES = ("client", "freelancer", "bids", "reviews")
+
+# Profile lists (reviews received, accepted/posted projects)
+PROFILE_INCLUDES = ("reviews", "projects")
+
+
+def _names(param, allowed):
+    """The names in ?param= (None if absent), in order; raises ValueError for unknown ones."""
+    raw = request.args.get(param)
+    if raw is None:
+        return None
+    names = tuple(dict.fromkeys(n.strip() for n in raw.split(',') if n.strip()))
+    unknown = [n for n in names if n not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown {param}: {', '.join(unknown)}")
+    return names
+
+
+def parse_fieldset(fields, includes, default_includes):
+    """
+    The request's Fieldset: ?fields= defaults to every name in `fields`
+    (an empty value too), ?include= to `default_includes` (an empty value
+    means no relations). Raises ValueError naming unknown entries.
+    """
+    chosen_fields = _names('fields', fields)
+    chosen_includes = _names('include', includes)
+    return Fieldset(
+        chosen_fields or tuple(fields),
+        tuple(default_includes) if chosen_includes is None else chosen_includes,
+    )
+
+
+@lru_cache(maxsize=64)
+def _schema(schema_class, only, many, exclude):
+    return schema_class(only=only, many=many, exclude=exclude)
+
+
+def fieldset_schema(schema_class, fieldset, many=False, exclude=()):
+    """A (cached) schema instance serializing exactly `fieldset`."""
+    only = tuple(sorted(set(fieldset.fields) | set(fieldset.includes)))
+    return _schema(schema_class, only, many, tuple(exclude))
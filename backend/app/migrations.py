@@ -0,0 +1,73 @@
+# Lightweight, idempotent schema upgrades for existing databases.
+# `flask init-db` only creates missing tables; `flask upgrade-db` also adds
+# columns and indexes that were introduced after a table was created.
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+
+
+def existing_index_names(engine, table_name):
+    if engine.dialect.name != "sqlite":
+        return {i["name"] for i in inspect(engine).get_indexes(table_name)}
+    # SQLite reflection skips expression indexes; its catalog lists them all
+    with engine.connect() as conn:
+        return set(conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"),
+            {"table": table_name},
+        ).scalars())
+
+
+def upgrade_database():
+    """
+    Brings an existing database up to the current models:
+    creates missing tables, adds missing columns and creates missing
+    indexes. Safe to run repeatedly. Returns a list of applied changes.
+    """
+    from app import models  # noqa: F401  (register every table)
+
+    engine = db.engine
+    applied = []
+
+    existing_tables = set(inspect(engine).get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            table.create(engine)
+            applied.append(f"created table {table.name}")
+            continue
+
+        existing_columns = {c["name"] for c in inspect(engine).get_columns(table.name)}
+        quote = engine.dialect.identifier_preparer.quote
+        with engine.begin() as conn:
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                ddl = (
+                    f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} "
+                    f"{column.type.compile(engine.dialect)}"
+                )
+                if column.server_default is not None:
+                    default = column.server_default.arg
+                    ddl += f" DEFAULT {getattr(default, 'text', default)}"
+                conn.execute(text(ddl))
+                applied.append(f"added column {table.name}.{column.name}")
+
+        existing_indexes = existing_index_names(engine, table.name)
+        for index in table.indexes:
+            if index.name in existing_indexes:
+                continue
+            try:
+                index.create(engine)
+            except IntegrityError:
+                # A unique index over data that already has duplicates
+                applied.append(f"SKIPPED unique index {index.name}: remove the duplicate rows first")
+                continue
+            applied.append(f"created index {index.name}")
+
+    from app.search import FTS_TABLE, install_search_index
+    with engine.begin() as conn:
+        if install_search_index(conn):
+            applied.append(f"created search index {FTS_TABLE}")
+
+    return applied
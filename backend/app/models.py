@@ -1,7 +1,15 @@
+import json
 from datetime import datetime
 from app import db  # Assumes 'db' is created in 'app.py' or 'app/__init__.py'
 from werkzeug.security import generate_password_hash, check_password_hash
 
+def decode_skill_vector(text):
+    """Parses a stored skill vector; JSON object keys are skill ids as strings."""
+    if text is None:
+        return None
+    return {int(skill_id): weight for skill_id, weight in json.loads(text).items()}
+
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
@@ -10,8 +18,21 @@ class User(db.Model):
     is_freelancer = db.Column(db.Boolean, default=False, nullable=False)
     bio = db.Column(db.Text, nullable=True)
     skills = db.Column(db.Text, nullable=True)
+    # Bitset of Skill ids for `skills` (see app/skills.py); the CSV stays the API format
+    skill_bits = db.Column(db.LargeBinary, nullable=True)
+    skill_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    # L2-normalized IDF weights {skill_id: weight} as JSON (SKILL_MATCH_MODE = "idf")
+    skill_vector = db.Column(db.Text, nullable=True)
 
     avg_rating = db.Column(db.Float, default=0.0)
+    # Running review aggregates (app/ratings.py); avg_rating is derived from them
+    rating_sum = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    rating_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    rating_1 = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    rating_2 = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    rating_3 = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    rating_4 = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    rating_5 = db.Column(db.Integer, default=0, server_default='0', nullable=False)
     completion_rate = db.Column(db.Float, default=0.0)
     on_time_rate = db.Column(db.Float, default=0.0)
     portfolio_score = db.Column(db.Float, default=0.0)
@@ -19,6 +40,9 @@ class User(db.Model):
     projects_accepted = db.Column(db.Integer, default=0, nullable=False)
     projects_completed = db.Column(db.Integer, default=0, nullable=False)
 
+    # Time of the last change to the row, for conditional GETs (app/conditional.py)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
     projects_as_client = db.relationship(
         'Project',
         foreign_keys='Project.client_id',
@@ -53,16 +77,37 @@ class User(db.Model):
         lazy='dynamic'
     )
 
+    # inverted skill index entries, freelancers only (see app/skills.py)
+    skill_links = db.relationship(
+        'UserSkill',
+        back_populates='user',
+        cascade="all, delete-orphan"
+    )
+
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
 
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
 
+    @property
+    def skill_mask(self):
+        """Skill bitset as an int, or None if it has not been computed yet."""
+        return None if self.skill_bits is None else int.from_bytes(self.skill_bits, 'little')
+
+    @property
+    def skill_weights(self):
+        """Sparse skill vector as {skill_id: weight}, or None if not computed yet."""
+        return decode_skill_vector(self.skill_vector)
+
     def __repr__(self):
         return f'<User {self.username}>'
 
 
+# IDF population size: freelancers with at least one skill (app/skills.py)
+db.Index('ix_user_freelancer_skills', User.is_freelancer, User.skill_count)
+
+
 class Project(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(150), nullable=False)
@@ -70,8 +115,17 @@ class Project(db.Model):
     budget = db.Column(db.Float, nullable=False)
     status = db.Column(db.String(20), default='open', nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     required_skills = db.Column(db.Text, nullable=True)
+    # Bitset of Skill ids for `required_skills` (see app/skills.py)
+    skill_bits = db.Column(db.LargeBinary, nullable=True)
+    skill_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    # L2-normalized IDF weights {skill_id: weight} as JSON (SKILL_MATCH_MODE = "idf")
+    skill_vector = db.Column(db.Text, nullable=True)
+
+    # Bumped whenever an input of the bid ranking changes (used as cache key)
+    ranking_version = db.Column(db.Integer, default=0, server_default='0', nullable=False)
 
     client_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     freelancer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
@@ -94,10 +148,10 @@ class Project(db.Model):
     )
 
     # explicitly indicate Bid.project_id is the FK used for this relationship
+    # (plain lists rather than lazy='dynamic', so list views can eager-load them)
     bids = db.relationship(
         'Bid',
         back_populates='project',
-        lazy='dynamic',
         cascade="all, delete-orphan",
         foreign_keys='Bid.project_id'
     )
@@ -105,7 +159,13 @@ class Project(db.Model):
     reviews = db.relationship(
         'Review',
         back_populates='project',
-        lazy='dynamic',
+        cascade="all, delete-orphan"
+    )
+
+    # inverted skill index entries (see app/skills.py)
+    skill_links = db.relationship(
+        'ProjectSkill',
+        back_populates='project',
         cascade="all, delete-orphan"
     )
 
@@ -117,15 +177,41 @@ class Project(db.Model):
         post_update=True  # helpful when circular FK updates happen
     )
 
+    @property
+    def skill_mask(self):
+        """Skill bitset as an int, or None if it has not been computed yet."""
+        return None if self.skill_bits is None else int.from_bytes(self.skill_bits, 'little')
+
+    @property
+    def skill_weights(self):
+        """Sparse skill vector as {skill_id: weight}, or None if not computed yet."""
+        return decode_skill_vector(self.skill_vector)
+
     def __repr__(self):
         return f'<Project {self.title}>'
 
 
+@db.event.listens_for(Project.__table__, 'after_create')
+def create_project_search_index(target, connection, **kw):
+    """Creates the full-text index alongside the project table (app/search.py)."""
+    from app.search import install_search_index
+    install_search_index(connection)
+
+# Project listing: open projects newest first, optionally per client or budget range
+db.Index('ix_project_status_created', Project.status, Project.created_at, Project.id)
+db.Index('ix_project_client_created', Project.client_id, Project.created_at, Project.id)
+db.Index('ix_project_status_budget', Project.status, Project.budget)
+# Freelancer side of the project lists (profiles: newest first), and the accepted-bid join
+db.Index('ix_project_freelancer_created', Project.freelancer_id, Project.created_at, Project.id)
+db.Index('ix_project_accepted_bid', Project.accepted_bid_id)
+
+
 class Bid(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     amount = db.Column(db.Float, nullable=False)
     proposal = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     proposed_timeline_days = db.Column(db.Integer, nullable=True)
 
@@ -145,15 +231,32 @@ class Bid(db.Model):
         foreign_keys=[freelancer_id]
     )
 
+    __table_args__ = (
+        # One bid per freelancer per project; also serves "bids of a project"
+        db.Index('uq_bid_project_freelancer', 'project_id', 'freelancer_id', unique=True),
+        # "projects this freelancer bid on" (ranking invalidation, accepted projects)
+        db.Index('ix_bid_freelancer', 'freelancer_id', 'project_id'),
+    )
+
     def __repr__(self):
         return f'<Bid {self.amount} on Project {self.project_id}>'
 
+# Sort key of "shortest timeline first": bids without a timeline sort last.
+# The index below is on this exact expression, so queries must use it as is.
+BID_TIMELINE_KEY = db.func.coalesce(Bid.proposed_timeline_days, db.literal_column("2147483647"))
+
+# Bids of a project in each order GET /project/<id>/bids offers
+db.Index('ix_bid_project_created', Bid.project_id, Bid.created_at, Bid.id)
+db.Index('ix_bid_project_amount', Bid.project_id, Bid.amount, Bid.id)
+db.Index('ix_bid_project_timeline', Bid.project_id, BID_TIMELINE_KEY, Bid.id)
+
 
 class Review(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     rating = db.Column(db.Integer, nullable=False)
     comment = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
     reviewer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -163,9 +266,128 @@ class Review(db.Model):
     reviewer = db.relationship('User', foreign_keys=[reviewer_id], back_populates='reviews_given')
     reviewee = db.relationship('User', foreign_keys=[reviewee_id], back_populates='reviews_received')
 
+    __table_args__ = (
+        # One review per reviewer per project
+        db.Index('uq_review_project_reviewer', 'project_id', 'reviewer_id', unique=True),
+        # Profile pages: reviews received / given, newest first
+        db.Index('ix_review_reviewee_created', 'reviewee_id', 'created_at'),
+        db.Index('ix_review_reviewer', 'reviewer_id'),
+    )
+
     def __repr__(self):
         return f'<Review {self.rating}/5 for Project {self.project_id}>'
 
+class ProjectRankingState(db.Model):
+    """
+    Maintained bid-ranking state of a project (see app/ranking_state.py):
+    per-feature min/max bounds over its bids and the ranking_version the
+    state reflects. Stale when version != Project.ranking_version.
+    """
+    __tablename__ = "project_ranking_state"
+
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
+    bid_count = db.Column(db.Integer, default=0, nullable=False)
+    bounds = db.Column(db.Text, nullable=False)  # JSON: {feature: [min, max]}
+
+    def __repr__(self):
+        return f'<ProjectRankingState {self.project_id} v{self.version}>'
+
+
+class BidRanking(db.Model):
+    """Raw ranking features of one bid plus its score under each priority."""
+    __tablename__ = "bid_ranking"
+
+    bid_id = db.Column(db.Integer, db.ForeignKey('bid.id'), primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+
+    price = db.Column(db.Float, nullable=False)
+    rating = db.Column(db.Float, nullable=False)
+    completion_rate = db.Column(db.Float, nullable=False)
+    on_time_rate = db.Column(db.Float, nullable=False)
+    skill_match = db.Column(db.Float, nullable=False)
+    portfolio_score = db.Column(db.Float, nullable=False)
+    timeline = db.Column(db.Float, nullable=False)
+
+    # Rounded final score per priority; each is indexed for ordered reads
+    score_balanced = db.Column(db.Float, nullable=False)
+    score_price = db.Column(db.Float, nullable=False)
+    score_time = db.Column(db.Float, nullable=False)
+    score_ratings = db.Column(db.Float, nullable=False)
+
+    def __repr__(self):
+        return f'<BidRanking bid={self.bid_id}>'
+
+# One index per priority matching "ORDER BY score DESC, bid_id" within a
+# project, so any page of a ranking is an index range scan
+db.Index('ix_bid_ranking_balanced', BidRanking.project_id, BidRanking.score_balanced.desc(), BidRanking.bid_id)
+db.Index('ix_bid_ranking_price', BidRanking.project_id, BidRanking.score_price.desc(), BidRanking.bid_id)
+db.Index('ix_bid_ranking_time', BidRanking.project_id, BidRanking.score_time.desc(), BidRanking.bid_id)
+db.Index('ix_bid_ranking_ratings', BidRanking.project_id, BidRanking.score_ratings.desc(), BidRanking.bid_id)
+
+
+class Skill(db.Model):
+    """Canonical skill vocabulary. The id doubles as the skill's bit position."""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    # Number of freelancers listing the skill (the IDF document frequency)
+    doc_freq = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+
+    def __repr__(self):
+        return f'<Skill {self.name}>'
+
+class SkillCorpus(db.Model):
+    """
+    Single row (id 1): the IDF population size, i.e. the number of
+    freelancers with at least one skill. Kept up to date by
+    set_user_skills alongside Skill.doc_freq (see app/skills.py).
+    """
+    __tablename__ = "skill_corpus"
+
+    id = db.Column(db.Integer, primary_key=True)
+    freelancer_count = db.Column(db.Integer, default=0, nullable=False)
+
+class ProjectSkill(db.Model):
+    """
+    Inverted skill index: one row per (skill, project). `is_open` mirrors
+    Project.status == 'open' so open-project posting lists are an index
+    range scan on (skill_id, is_open).
+    """
+    __tablename__ = "project_skill"
+
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), primary_key=True)
+    is_open = db.Column(db.Boolean, default=True, nullable=False)
+
+    project = db.relationship('Project', back_populates='skill_links')
+
+    __table_args__ = (
+        db.Index('ix_project_skill_open', 'skill_id', 'is_open', 'project_id'),
+        db.Index('ix_project_skill_project', 'project_id'),
+    )
+
+    def __repr__(self):
+        return f'<ProjectSkill skill={self.skill_id} project={self.project_id}>'
+
+class UserSkill(db.Model):
+    """
+    Inverted skill index over freelancers: one row per (skill, user).
+    The primary key order makes each skill's posting list a range scan.
+    """
+    __tablename__ = "user_skill"
+
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+
+    user = db.relationship('User', back_populates='skill_links')
+
+    __table_args__ = (
+        db.Index('ix_user_skill_user', 'user_id'),
+    )
+
+    def __repr__(self):
+        return f'<UserSkill skill={self.skill_id} user={self.user_id}>'
+
 # --- External Profile Import (Freelancer.com) ---
 from datetime import datetime
 
@@ -185,3 +407,7 @@ class ExternalProfile(db.Model):
     raw_data = db.Column(db.Text)
 
     user = db.relationship("User", backref=db.backref("external_profiles", lazy=True))
+
+    __table_args__ = (
+        db.Index('uq_external_profile_lookup', 'user_id', 'provider', 'external_username', unique=True),
+    )
@@ -0,0 +1,47 @@
+# Profile read model for GET /api/user/<id> and /api/user/profile.
+# A profile is the user row plus the first page of the reviews they received
+# and of their projects (accepted ones for a freelancer, posted ones for a
+# client), newest first. Each list is a keyset page (app/pagination.py)
+# with a cursor for the rest, so the query count and the response size stay
+# the same however many reviews and projects the user has.
+
+from sqlalchemy.orm import selectinload
+
+from app import db
+from app.models import Project, Review
+from app.pagination import keyset_page
+
+PROFILE_PAGE_SIZE = 10
+MAX_PROFILE_PAGE_SIZE = 50
+
+
+def received_reviews_page(user_id, after=None, limit=PROFILE_PAGE_SIZE):
+    """
+    Reviews received by the user, newest first, with their reviewer
+    loaded (ix_review_reviewee_created). Returns (reviews, next_key).
+    """
+    query = (
+        db.select(Review)
+        .where(Review.reviewee_id == user_id)
+        .options(selectinload(Review.reviewer))
+    )
+    return keyset_page(query, (Review.created_at, Review.id), after, limit)
+
+
+def user_projects_page(user, after=None, limit=PROFILE_PAGE_SIZE):
+    """
+    The projects a freelancer was hired for, or the ones a client posted,
+    newest first, with their client loaded. Returns (projects, next_key).
+    """
+    owner = Project.freelancer_id if user.is_freelancer else Project.client_id
+    query = (
+        db.select(Project)
+        .where(owner == user.id)
+        .options(selectinload(Project.client))
+    )
+    return keyset_page(query, (Project.created_at, Project.id), after, limit)
+
+
+def projects_key(user):
+    """Response key of the user's project list."""
+    return 'accepted_projects' if user.is_freelancer else 'posted_projects'
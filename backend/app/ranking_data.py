@@ -0,0 +1,175 @@
+# Data-access layer for bid ranking.
+# Loads everything calculate_ranked_bids() needs with set-based,
+# column-only queries and returns a plain snapshot, so the ranking
+# itself runs without touching the database.
+
+from collections import namedtuple
+
+from app import db
+from app.models import User, Project, Bid, decode_skill_vector
+
+# Plain rows exposing the same attribute names as the ORM models,
+# so compute_features_for_bid() works on either.
+ProjectRow = namedtuple(
+    "ProjectRow", ["id", "title", "required_skills", "skill_mask", "skill_weights"]
+)
+BidRow = namedtuple(
+    "BidRow",
+    ["id", "amount", "proposal", "proposed_timeline_days", "freelancer_id", "project_id"]
+)
+FreelancerRow = namedtuple(
+    "FreelancerRow",
+    ["id", "username", "avg_rating", "completion_rate",
+     "on_time_rate", "portfolio_score", "skills", "skill_mask", "skill_weights"]
+)
+
+RankingSnapshot = namedtuple("RankingSnapshot", ["project", "bids", "freelancers"])
+
+
+def _mask(skill_bits):
+    """Decodes a stored skill bitset (None if it has not been computed)."""
+    return None if skill_bits is None else int.from_bytes(skill_bits, 'little')
+
+
+def load_ranking_versions(project_ids):
+    """Returns {project_id: ranking_version} for the projects that exist."""
+    if not project_ids:
+        return {}
+    return dict(db.session.execute(
+        db.select(Project.id, Project.ranking_version)
+        .where(Project.id.in_(set(project_ids)))
+    ).all())
+
+
+def load_ranking_heads(project_ids):
+    """
+    Returns {project_id: (ranking_version, title)} for the projects that
+    exist: the version keys cached rankings, the title is shown with them
+    but is not a ranking input.
+    """
+    if not project_ids:
+        return {}
+    return {
+        project_id: (version, title)
+        for project_id, version, title in db.session.execute(
+            db.select(Project.id, Project.ranking_version, Project.title)
+            .where(Project.id.in_(set(project_ids)))
+        )
+    }
+
+
+def bump_ranking_version(project_id):
+    """
+    Marks a project's ranking inputs as changed (e.g. a new bid, or its
+    required skills were edited). Runs in the caller's transaction and
+    returns the new version.
+    """
+    db.session.execute(
+        db.update(Project)
+        .where(Project.id == project_id)
+        .values(ranking_version=Project.ranking_version + 1)
+    )
+    return db.session.execute(
+        db.select(Project.ranking_version).where(Project.id == project_id)
+    ).scalar()
+
+
+def bump_ranking_versions(project_ids):
+    """
+    Marks several projects as changed with one UPDATE (e.g. a bulk bid
+    import); their maintained ranking states are rebuilt on the next read.
+    Runs in the caller's transaction.
+    """
+    db.session.execute(
+        db.update(Project)
+        .where(Project.id.in_(list(project_ids)))
+        .values(ranking_version=Project.ranking_version + 1),
+        execution_options={"synchronize_session": False}
+    )
+
+
+def bump_ranking_versions_for_bidder(freelancer_id):
+    """
+    Marks every project the freelancer has bid on as changed (their
+    rating or skills changed). Runs in the caller's transaction.
+    """
+    db.session.execute(
+        db.update(Project)
+        .where(Project.id.in_(
+            db.select(Bid.project_id).where(Bid.freelancer_id == freelancer_id)
+        ))
+        .values(ranking_version=Project.ranking_version + 1),
+        execution_options={"synchronize_session": False}
+    )
+
+
+def load_ranking_snapshot(project_id):
+    """
+    Fetches the project, its bids and the bidding freelancers' ranking
+    columns. Returns None if the project does not exist.
+    """
+    return load_ranking_snapshots([project_id]).get(project_id)
+
+
+def load_ranking_snapshots(project_ids):
+    """
+    Batch version of load_ranking_snapshot(). Uses three queries no
+    matter how many projects are requested: projects, their bids, and
+    the distinct bidders (a freelancer who bid on several of the
+    projects is loaded once and shared between snapshots).
+
+    Returns a dict of project_id -> RankingSnapshot; missing projects
+    are simply absent.
+    """
+    project_ids = list(set(project_ids))
+    if not project_ids:
+        return {}
+
+    projects = db.session.execute(
+        db.select(
+            Project.id, Project.title, Project.required_skills,
+            Project.skill_bits, Project.skill_vector
+        )
+        .where(Project.id.in_(project_ids))
+    ).all()
+    if not projects:
+        return {}
+
+    bid_rows = db.session.execute(
+        db.select(
+            Bid.id, Bid.amount, Bid.proposal, Bid.proposed_timeline_days,
+            Bid.freelancer_id, Bid.project_id
+        )
+        .where(Bid.project_id.in_([p.id for p in projects]))
+        .order_by(Bid.id)
+    ).all()
+
+    freelancers = {}
+    freelancer_ids = {row.freelancer_id for row in bid_rows}
+    if freelancer_ids:
+        freelancers = {
+            row.id: FreelancerRow(*row[:-2], _mask(row.skill_bits), decode_skill_vector(row.skill_vector))
+            for row in db.session.execute(
+                db.select(
+                    User.id, User.username, User.avg_rating, User.completion_rate,
+                    User.on_time_rate, User.portfolio_score, User.skills,
+                    User.skill_bits, User.skill_vector
+                )
+                .where(User.id.in_(freelancer_ids))
+            )
+        }
+
+    bids_by_project = {p.id: [] for p in projects}
+    for row in bid_rows:
+        bids_by_project[row.project_id].append(BidRow(*row))
+
+    snapshots = {}
+    for p in projects:
+        bids = bids_by_project[p.id]
+        snapshots[p.id] = RankingSnapshot(
+            ProjectRow(*p[:-2], _mask(p.skill_bits), decode_skill_vector(p.skill_vector)),
+            bids,
+            {b.freelancer_id: freelancers[b.freelancer_id]
+             for b in bids if b.freelancer_id in freelancers}
+        )
+    return snapshots
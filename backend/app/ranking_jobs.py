@@ -0,0 +1,71 @@
+# Background ranking jobs.
+# Ranking a project with a very large number of bids can take longer than
+# a request should. POST /api/rank_bids/jobs queues the work here and
+# returns a job id at once; the client polls GET /api/rank_bids/jobs/<id>.
+# Jobs run on a small thread pool inside an app context; the CPU-heavy
+# feature extraction itself is farmed out to app/ranking_pool.py.
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from threading import Lock
+
+from app.cache import ConfiguredCache
+
+
+class RankingJobs:
+    """
+    In-process job queue following the Flask extension pattern.
+    Job status is kept in an LRU of RANKING_JOB_HISTORY entries; with
+    RANKING_CACHE_BACKEND = "disk" it is shared, so any worker can answer
+    the polling requests.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._executor = None
+        self._jobs = ConfiguredCache('ranking_jobs', 'RANKING_CACHE_BACKEND', size_key='RANKING_JOB_HISTORY')
+        self._lock = Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self._jobs.init_app(app)
+        self._executor = ThreadPoolExecutor(
+            max_workers=app.config.get('RANKING_JOB_WORKERS', 2),
+            thread_name_prefix='ranking-job'
+        )
+
+    def submit(self, fn, *args):
+        """Queues fn(*args) to run in an app context; returns the job id."""
+        job_id = uuid.uuid4().hex
+        self._jobs.set(job_id, {
+            "job_id": job_id,
+            "status": "pending",
+            "submitted_at": datetime.utcnow().isoformat(),
+        })
+        self._executor.submit(self._run, job_id, fn, args)
+        return job_id
+
+    def get(self, job_id):
+        """Returns a copy of the job's status dict, or None if unknown/expired."""
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = dict(self._jobs.get(job_id) or {"job_id": job_id})
+            job.update(fields)
+            self._jobs.set(job_id, job)
+
+    def _run(self, job_id, fn, args):
+        self._update(job_id, status="running")
+        try:
+            with self.app.app_context():
+                result = fn(*args)
+        except Exception as e:
+            self.app.logger.exception("Ranking job %s failed", job_id)
+            self._update(job_id, status="failed", error=str(e),
+                         finished_at=datetime.utcnow().isoformat())
+        else:
+            self._update(job_id, status="done", result=result,
+                         finished_at=datetime.utcnow().isoformat())
@@ -1,7 +1,11 @@
 # This file contains the core business logic for ranking bids.
 # It is designed to be imported by routes.py.
 
+import heapq
+
+from flask import current_app
 from app.models import User, Project, Bid
+from app.skills import parse_skills, jaccard_mask_match, idf_mask_match
 
 # --- Weights Configuration ---
 BASE_WEIGHTS = {
@@ -16,19 +20,57 @@ BASE_WEIGHTS = {
 _total = sum(BASE_WEIGHTS.values())
 BASE_WEIGHTS = {k: v / _total for k, v in BASE_WEIGHTS.items()}
 
+# Column order used by the vectorized engine (same order as BASE_WEIGHTS)
+FEATURE_KEYS = tuple(BASE_WEIGHTS.keys())
+# Lower is better for these features, so their scaled value is inverted
+INVERTED_FEATURES = ("price", "timeline")
+
+# Priorities with their own weight set (anything else ranks as "balanced")
+PRIORITIES = ("balanced", "price", "time", "ratings")
+
 # --- Helper Functions ---
 
 def jaccard_skill_match(project_skills, freelancer_skills):
     """Calculates Jaccard similarity between two lists of skills."""
-    if not project_skills:
+    ps = set([s.strip().lower() for s in project_skills]) - {""}
+    if not ps:
         return 0.5  # If no skills required, it's a neutral match
-    ps = set([s.strip().lower() for s in project_skills])
-    fs = set([s.strip().lower() for s in freelancer_skills])
+    fs = set([s.strip().lower() for s in freelancer_skills]) - {""}
     inter = ps.intersection(fs)
     union = ps.union(fs)
     return len(inter) / len(union) if union else 0.0
 
 
+def skill_match_mode():
+    """The configured SKILL_MATCH_MODE: "jaccard" (default) or "idf"."""
+    return current_app.config.get("SKILL_MATCH_MODE", "jaccard")
+
+
+def skill_match(project, freelancer, mode="jaccard"):
+    """
+    Skill match between a project and a freelancer. In "idf" mode it is
+    the cosine of their precomputed IDF skill vectors; otherwise, or for
+    rows without vectors, the Jaccard similarity of the precomputed skill
+    bitsets, falling back to parsing the CSV columns for rows that have
+    not been indexed yet.
+    """
+    if mode == "idf":
+        project_weights = project.skill_weights
+        freelancer_weights = freelancer.skill_weights
+        if project_weights is not None and (freelancer_weights is not None or not freelancer.skills):
+            return idf_mask_match(project_weights, freelancer_weights or {})
+
+    project_mask = project.skill_mask
+    freelancer_mask = freelancer.skill_mask
+    if project_mask is not None and (freelancer_mask is not None or not freelancer.skills):
+        return jaccard_mask_match(project_mask, freelancer_mask or 0)
+
+    return jaccard_skill_match(
+        parse_skills(project.required_skills),
+        parse_skills(freelancer.skills)
+    )
+
+
 def normalize_feature_list(feature_values, invert=False):
     """Applies Min-Max scaling to a list of values."""
     if not feature_values:
@@ -44,6 +86,14 @@ def normalize_feature_list(feature_values, invert=False):
     return norm
 
 
+def normalize_value(value, lo, hi, invert=False):
+    """Min-Max scales one value against known bounds (see normalize_feature_list)."""
+    if hi == lo:
+        return 0.5
+    scaled = (value - lo) / (hi - lo)
+    return 1 - scaled if invert else scaled
+
+
 def adjust_weights_for_priority(priority):
     """Boosts weights based on priority and re-normalizes."""
     w = BASE_WEIGHTS.copy()
@@ -62,15 +112,12 @@ def adjust_weights_for_priority(priority):
     return {k: v / total for k, v in w.items()}
 
 
-def compute_features_for_bid(bid, freelancer, project):
+def compute_freelancer_features(freelancer, project, skill_mode="jaccard"):
     """
-    Extracts raw feature values from the DB models.
+    Extracts the bid-independent features: the freelancer's stats and
+    their skill match with the project (see skill_match() for skill_mode).
     """
     features = {}
-    features["price"] = float(bid.amount)
-    # Use a default timeline (e.g., 30 days) if not provided
-    features["timeline"] = float(bid.proposed_timeline_days or 30) 
-    
     # Freelancer stats
     features["rating"] = float(freelancer.avg_rating or 0) / 5.0 # Normalize 0-5 scale to 0-1
     features["completion_rate"] = float(freelancer.completion_rate or 0)
@@ -78,101 +125,213 @@ def compute_features_for_bid(bid, freelancer, project):
     features["portfolio_score"] = float(freelancer.portfolio_score or 0)
 
     # Skill match
-    project_skills = project.required_skills.split(',') if project.required_skills else []
-    freelancer_skills = freelancer.skills.split(',') if freelancer.skills else []
-    features["skill_match"] = jaccard_skill_match(project_skills, freelancer_skills)
+    features["skill_match"] = skill_match(project, freelancer, skill_mode)
+
+    return features
+
+
+def compute_features_for_bid(bid, freelancer, project, skill_mode="jaccard"):
+    """
+    Extracts raw feature values from the DB models.
+    """
+    features = {}
+    features["price"] = float(bid.amount)
+    # Use a default timeline (e.g., 30 days) if not provided
+    features["timeline"] = float(bid.proposed_timeline_days or 30) 
     
+    features.update(compute_freelancer_features(freelancer, project, skill_mode))
     return features
 
 # --- Main Ranking Function ---
 
-def calculate_ranked_bids(project, bids, priority='balanced'):
+def collect_bid_features(project, bids, freelancers=None):
     """
-    The main logic function.
-    Takes DB objects and a priority string, returns a dictionary with
-    weights and a list of ranked bid data.
+    Step 1 of the ranking: resolves each bid's freelancer and computes
+    its raw features. Shared by every scoring engine.
+
+    `freelancers` maps freelancer_id to a freelancer object (e.g. from
+    ranking_data.load_ranking_snapshot()). If omitted, the bidders are
+    loaded with a single query.
+
+    Projects with at least RANKING_POOL_THRESHOLD bids are split into
+    chunks and processed by a worker pool (app/ranking_pool.py).
     """
-    
-    # --- Step 1: Compute raw features ---
+    if freelancers is None:
+        freelancer_ids = {bid.freelancer_id for bid in bids}
+        freelancers = {
+            u.id: u for u in User.query.filter(User.id.in_(freelancer_ids)).all()
+        } if freelancer_ids else {}
+
+    skill_mode = skill_match_mode()
+    threshold = current_app.config.get("RANKING_POOL_THRESHOLD")
+    if threshold and len(bids) >= threshold:
+        from app.ranking_pool import collect_bid_features_parallel
+        return collect_bid_features_parallel(
+            project, bids, freelancers, skill_mode,
+            workers=current_app.config.get("RANKING_POOL_WORKERS"),
+            chunk_size=current_app.config.get("RANKING_POOL_CHUNK_SIZE", 5000)
+        )
+
     per_bid_data = []
-    freelancers = {} # Cache freelancers
-    
     for bid in bids:
-        if bid.freelancer_id not in freelancers:
-            freelancers[bid.freelancer_id] = User.query.get(bid.freelancer_id)
-        
-        freelancer = freelancers[bid.freelancer_id]
+        freelancer = freelancers.get(bid.freelancer_id)
         if not freelancer:
             continue
             
-        features = compute_features_for_bid(bid, freelancer, project)
+        features = compute_features_for_bid(bid, freelancer, project, skill_mode)
         per_bid_data.append({
             "bid": bid,
             "freelancer": freelancer,
             "features": features
         })
 
+    return per_bid_data
+
+
+def format_ranked_bid(b_data, score, normalized=None, proposal_chars=None):
+    """
+    Builds the API representation of one scored bid.
+    `normalized` adds the debug feature dicts when given.
+    `proposal_chars`: None keeps the full proposal, 0 omits it and a
+    positive number truncates it to that many characters.
+    """
+    result = {
+        "bid_id": b_data["bid"].id,
+        "freelancer_id": b_data["freelancer"].id,
+        "freelancer_name": b_data["freelancer"].username,
+        "bid_amount": b_data["bid"].amount,
+        "timeline_days": b_data["bid"].proposed_timeline_days,
+        "score": round(score, 4),
+    }
+
+    proposal = b_data["bid"].proposal
+    if proposal_chars is None:
+        result["proposal"] = proposal
+    elif proposal_chars > 0:
+        result["proposal"] = proposal[:proposal_chars]
+        result["proposal_truncated"] = len(proposal) > proposal_chars
+
+    if normalized is not None:
+        result["debug_features"] = b_data["features"]
+        result["debug_normalized"] = normalized
+    return result
+
+
+class ScoredBids:
+    """
+    Final scores of every bid for one priority. Ordering and formatting
+    are deferred so that a page of results only pays for the bids it
+    returns (see page()).
+    """
+
+    def __init__(self, per_bid_data, weights, scores, normalized):
+        self.per_bid_data = per_bid_data
+        self.weights = weights
+        self.scores = scores          # list of floats, one per bid
+        self.normalized = normalized  # per-bid lists in FEATURE_KEYS order
+
+    def __len__(self):
+        return len(self.per_bid_data)
+
+    def top_indices(self, offset=0, limit=None):
+        """
+        Bid indices for ranks [offset, offset + limit), best first.
+        Ties on the rounded score keep input order. With a limit only the
+        first offset + limit bids are selected (heap), not a full sort.
+        """
+        scores = self.scores
+        if limit is None:
+            order = sorted(range(len(scores)), key=lambda i: -round(scores[i], 4))
+            return order[offset:]
+        order = heapq.nsmallest(
+            offset + limit, range(len(scores)), key=lambda i: (-round(scores[i], 4), i)
+        )
+        return order[offset:]
+
+    def normalized_features(self, i):
+        return dict(zip(FEATURE_KEYS, self.normalized[i]))
+
+    def page(self, offset=0, limit=None, include_debug=True, proposal_chars=None):
+        """Formats the bids for ranks [offset, offset + limit)."""
+        return [
+            format_ranked_bid(
+                self.per_bid_data[i],
+                float(self.scores[i]),
+                self.normalized_features(i) if include_debug else None,
+                proposal_chars
+            )
+            for i in self.top_indices(offset, limit)
+        ]
+
+
+def score_features(per_bid_data, priority='balanced'):
+    """Runs the configured scoring engine over already-collected features."""
+    if current_app.config.get("RANKING_ENGINE", "python") == "numpy":
+        from app.ranking_vectorized import score_bids_vectorized
+        return score_bids_vectorized(per_bid_data, priority)
+
+    return score_bids(per_bid_data, priority)
+
+
+def score_ranked_bids(project, bids, priority='balanced', freelancers=None):
+    """
+    Computes features and scores for every bid and returns a ScoredBids,
+    or None if none of the bids has a valid freelancer.
+
+    The scoring engine is chosen by the RANKING_ENGINE config value:
+    "python" (default) or "numpy" (see app/ranking_vectorized.py).
+    """
+
+    # --- Step 1: Compute raw features ---
+    per_bid_data = collect_bid_features(project, bids, freelancers)
+
     if not per_bid_data:
+        return None
+
+    return score_features(per_bid_data, priority)
+
+
+def calculate_ranked_bids(project, bids, priority='balanced', freelancers=None,
+                          offset=0, limit=None, include_debug=True, proposal_chars=None):
+    """
+    The main logic function.
+    Takes DB objects (or a ranking_data snapshot) and a priority string,
+    returns a dictionary with weights and a list of ranked bid data.
+    `offset`/`limit` return a single page of the ranking.
+    """
+    scored = score_ranked_bids(project, bids, priority, freelancers)
+    if scored is None:
         return {"error": "No valid freelancers found for bids"}
 
+    return {
+        "weights_applied": scored.weights,
+        "total_bids": len(scored),
+        "ranked_bids": scored.page(offset, limit, include_debug, proposal_chars)
+    }
+
+
+def score_bids(per_bid_data, priority='balanced'):
+    """
+    Pure-Python scoring engine: normalizes and weights the per-bid
+    features produced by collect_bid_features().
+    """
+
     # --- Step 2: Normalize features across all bids ---
-    prices = [b["features"]["price"] for b in per_bid_data]
-    timelines = [b["features"]["timeline"] for b in per_bid_data]
-    ratings = [b["features"]["rating"] for b in per_bid_data]
-    completion = [b["features"]["completion_rate"] for b in per_bid_data]
-    on_time = [b["features"]["on_time_rate"] for b in per_bid_data]
-    skills = [b["features"]["skill_match"] for b in per_bid_data]
-    portfolios = [b["features"]["portfolio_score"] for b in per_bid_data]
-
-    # Normalize (note: price and timeline are inverted)
-    norm_price = normalize_feature_list(prices, invert=True)
-    norm_timeline = normalize_feature_list(timelines, invert=True)
-    norm_rating = normalize_feature_list(ratings)
-    norm_completion = normalize_feature_list(completion)
-    norm_on_time = normalize_feature_list(on_time)
-    norm_skills = normalize_feature_list(skills)
-    norm_portfolio = normalize_feature_list(portfolios)
+    # (note: price and timeline are inverted)
+    columns = [
+        normalize_feature_list(
+            [b["features"][k] for b in per_bid_data],
+            invert=k in INVERTED_FEATURES
+        )
+        for k in FEATURE_KEYS
+    ]
+    normalized = [list(row) for row in zip(*columns)]
 
     # --- Step 3: Choose weights based on priority ---
     weights = adjust_weights_for_priority(priority)
 
-    # --- Step 4: Calculate final score ---
-    results = []
-    for i, b_data in enumerate(per_bid_data):
-        nf = {
-            "price": norm_price[i],
-            "rating": norm_rating[i],
-            "completion_rate": norm_completion[i],
-            "on_time_rate": norm_on_time[i],
-            "skill_match": norm_skills[i],
-            "portfolio_score": norm_portfolio[i],
-            "timeline": norm_timeline[i]
-        }
-        
-        # Calculate final score using the dynamic weights
-        score = sum(weights[k] * nf[k] for k in weights)
-        
-        results.append({
-            "bid_id": b_data["bid"].id,
-            "freelancer_id": b_data["freelancer"].id,
-            "freelancer_name": b_data["freelancer"].username,
-            "bid_amount": b_data["bid"].amount,
-            "timeline_days": b_data["bid"].proposed_timeline_days,
-            
-            "proposal": b_data["bid"].proposal, 
-            # --- [END OF ADDITION] ---
-
-            "score": round(score, 4),
-            "debug_features": b_data["features"],
-            "debug_normalized": nf
-        })
-
-    # --- Step 5: Sort by descending score ---
-    results.sort(key=lambda x: x["score"], reverse=True)
+    # --- Step 4: Calculate final score using the dynamic weights ---
+    weight_list = [weights[k] for k in FEATURE_KEYS]
+    scores = [sum(w * v for w, v in zip(weight_list, row)) for row in normalized]
 
-    
-    
-    return {
-        "weights_applied": weights,
-        "ranked_bids": results
-    }
\ No newline at end of file
+    return ScoredBids(per_bid_data, weights, scores, normalized)
@@ -0,0 +1,100 @@
+# Process-pool feature extraction for very large bid sets.
+# collect_bid_features() hands the work to this module once a project has
+# at least RANKING_POOL_THRESHOLD bids. The bids are split into chunks of
+# plain, picklable rows, the features of each chunk are computed in a
+# worker process (which has no app context, so settings such as the skill
+# match mode are passed in explicitly), and the results are stitched back in bid order. The
+# global min-max normalization and scoring then run in the caller, exactly
+# as for small projects.
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+
+from app.ranking_data import BidRow, FreelancerRow, ProjectRow
+
+_pool = None
+_pool_lock = Lock()
+
+
+def get_pool(workers=None):
+    """Returns the shared worker pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # "spawn" keeps the workers free of the parent's DB connections
+            _pool = ProcessPoolExecutor(
+                max_workers=workers or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _extract_chunk(project, bids, freelancers, skill_mode):
+    """Worker entry point: raw features for one chunk of bids."""
+    from app.ranking_logic import compute_features_for_bid
+
+    return [
+        compute_features_for_bid(bid, freelancers[bid.freelancer_id], project, skill_mode)
+        for bid in bids
+    ]
+
+
+def _as_rows(project, bids, freelancers, skill_mode):
+    """
+    Copies (possibly ORM) inputs into plain rows carrying only what the
+    features need: no proposal text or usernames, and no bidder skills CSV
+    when the skill mask (and, in "idf" mode, the vector) is available, which
+    keeps the pickled chunks small.
+    The CSV is kept while the project itself is not indexed, since
+    skill_match() then compares the text of both sides.
+    """
+    def csv(row):
+        indexed = row.skill_mask is not None and (row.skill_weights is not None or skill_mode != "idf")
+        return None if indexed and project.skill_mask is not None else row.skills
+
+    project_row = ProjectRow(project.id, None, project.required_skills,
+                             project.skill_mask, project.skill_weights)
+    bid_rows = [
+        BidRow(b.id, b.amount, None, b.proposed_timeline_days, b.freelancer_id, b.project_id)
+        for b in bids
+    ]
+    freelancer_rows = {
+        f.id: FreelancerRow(f.id, None, f.avg_rating, f.completion_rate,
+                            f.on_time_rate, f.portfolio_score, csv(f), f.skill_mask,
+                            f.skill_weights)
+        for f in freelancers.values()
+    }
+    return project_row, bid_rows, freelancer_rows
+
+
+def collect_bid_features_parallel(project, bids, freelancers, skill_mode="jaccard",
+                                  workers=None, chunk_size=5000):
+    """
+    Same result as ranking_logic.collect_bid_features(), with the feature
+    extraction spread over the process pool in chunks of `chunk_size` bids.
+    """
+    valid = [bid for bid in bids if freelancers.get(bid.freelancer_id)]
+    project_row, bid_rows, freelancer_rows = _as_rows(project, valid, freelancers, skill_mode)
+
+    futures = []
+    pool = get_pool(workers)
+    for start in range(0, len(bid_rows), chunk_size):
+        chunk = bid_rows[start:start + chunk_size]
+        chunk_freelancers = {b.freelancer_id: freelancer_rows[b.freelancer_id] for b in chunk}
+        futures.append(pool.submit(_extract_chunk, project_row, chunk, chunk_freelancers, skill_mode))
+
+    per_bid_data = []
+    i = 0
+    for future in futures:
+        for features in future.result():
+            bid = valid[i]
+            per_bid_data.append({
+                "bid": bid,
+                "freelancer": freelancers[bid.freelancer_id],
+                "features": features
+            })
+            i += 1
+    return per_bid_data
+
@@ -0,0 +1,300 @@
+# Incrementally maintained bid-ranking state.
+# Every project keeps a ProjectRankingState (per-feature min/max bounds and
+# the ranking_version it reflects) and one BidRanking row per bid (raw
+# features plus the rounded score under each priority). Ranking reads are
+# then ordered index scans over bid_ranking instead of a full recompute.
+#
+# A new or withdrawn bid that leaves every bound where it was only inserts
+# or deletes its own row; the other bids' normalized values, and therefore
+# their scores, are unchanged. Anything else (a bound moves, a bidder's
+# rating/skills or the project's skills change) leaves the state stale,
+# and it is rebuilt in full on the next read.
+
+import json
+from collections import namedtuple
+
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import User, Project, Bid, BidRanking, ProjectRankingState
+from app.ranking_data import (
+    BidRow,
+    bump_ranking_version,
+    load_ranking_snapshots,
+    load_ranking_versions,
+)
+from app.ranking_logic import (
+    FEATURE_KEYS,
+    INVERTED_FEATURES,
+    PRIORITIES,
+    adjust_weights_for_priority,
+    collect_bid_features,
+    compute_features_for_bid,
+    format_ranked_bid,
+    normalize_value,
+    score_features,
+    skill_match_mode,
+)
+
+# The bidder fields a ranked bid needs for its API representation
+RankedBidder = namedtuple("RankedBidder", ["id", "username"])
+
+SCORE_COLUMNS = {p: getattr(BidRanking, f"score_{p}") for p in PRIORITIES}
+
+
+def score_column(priority):
+    """bid_ranking column holding the scores for a priority."""
+    return SCORE_COLUMNS.get(priority, SCORE_COLUMNS["balanced"])
+
+
+def _normalized(features, bounds):
+    return {
+        k: normalize_value(features[k], *bounds[k], invert=k in INVERTED_FEATURES)
+        for k in FEATURE_KEYS
+    }
+
+
+def _priority_scores(normalized):
+    """Rounded score of one normalized feature row under every priority."""
+    scores = {}
+    for priority in PRIORITIES:
+        weights = adjust_weights_for_priority(priority)
+        scores[f"score_{priority}"] = round(sum(weights[k] * normalized[k] for k in weights), 4)
+    return scores
+
+
+# --- Full rebuild ---
+
+def rebuild_ranking_states(project_ids):
+    """
+    Recomputes the state and every bid_ranking row of the given projects
+    from scratch, using the configured scoring engine. Commits; if a
+    concurrent read rebuilt one of them first, its rows are kept instead.
+    """
+    versions = load_ranking_versions(project_ids)
+    snapshots = load_ranking_snapshots(list(versions))
+
+    rows = []
+    states = []
+    for project_id, snapshot in snapshots.items():
+        per_bid_data = collect_bid_features(snapshot.project, snapshot.bids, snapshot.freelancers)
+
+        bounds = {}
+        if per_bid_data:
+            for k in FEATURE_KEYS:
+                values = [b["features"][k] for b in per_bid_data]
+                bounds[k] = [min(values), max(values)]
+
+            scored = {p: score_features(per_bid_data, p) for p in PRIORITIES}
+            for i, b_data in enumerate(per_bid_data):
+                row = {"bid_id": b_data["bid"].id, "project_id": project_id}
+                row.update(b_data["features"])
+                for p in PRIORITIES:
+                    row[f"score_{p}"] = round(float(scored[p].scores[i]), 4)
+                rows.append(row)
+
+        states.append({
+            "project_id": project_id,
+            "version": versions[project_id],
+            "bid_count": len(per_bid_data),
+            "bounds": json.dumps(bounds),
+        })
+
+    ids = list(snapshots)
+    db.session.execute(db.delete(BidRanking).where(BidRanking.project_id.in_(ids)))
+    db.session.execute(db.delete(ProjectRankingState).where(ProjectRankingState.project_id.in_(ids)))
+    if rows:
+        db.session.execute(db.insert(BidRanking), rows)
+    if states:
+        db.session.execute(db.insert(ProjectRankingState), states)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another request inserted the same state/bid_ranking keys between
+        # our delete and insert; the caller re-reads what it committed
+        db.session.rollback()
+
+
+def ensure_fresh_states(project_ids):
+    """
+    Rebuilds the states that are missing or older than the project's
+    ranking_version. Returns {project_id: row} (title, bid_count, bounds)
+    for the projects that exist.
+    """
+    def load():
+        return db.session.execute(
+            db.select(
+                Project.id, Project.title, Project.ranking_version,
+                ProjectRankingState.version, ProjectRankingState.bid_count,
+                ProjectRankingState.bounds
+            )
+            .outerjoin(ProjectRankingState, ProjectRankingState.project_id == Project.id)
+            .where(Project.id.in_(set(project_ids)))
+        ).all()
+
+    rows = load()
+    stale = [r.id for r in rows if r.version != r.ranking_version]
+    if stale:
+        rebuild_ranking_states(stale)
+        rows = load()
+    return {r.id: r for r in rows}
+
+
+# --- Incremental updates (run inside the caller's transaction) ---
+
+def record_bid_placed(bid):
+    """
+    Called by place_bid once the new bid is added to the session.
+    Bumps the project's ranking_version and, if the state was fresh and
+    the bid stays within every feature bound, inserts its bid_ranking row
+    (an O(log n) index insert) instead of invalidating the whole state.
+    """
+    db.session.flush()  # assigns bid.id
+    version = bump_ranking_version(bid.project_id)
+
+    state = db.session.get(ProjectRankingState, bid.project_id)
+    if state is None or state.version != version - 1:
+        return  # already stale; rebuilt on the next read
+
+    bounds = json.loads(state.bounds)
+    freelancer = db.session.get(User, bid.freelancer_id)
+    project = db.session.get(Project, bid.project_id)
+    if not bounds or freelancer is None:
+        return
+
+    features = compute_features_for_bid(bid, freelancer, project, skill_match_mode())
+    if any(not lo <= features[k] <= hi for k, (lo, hi) in bounds.items()):
+        return  # a bound moves, so every normalized value changes
+
+    row = {"bid_id": bid.id, "project_id": bid.project_id}
+    row.update(features)
+    row.update(_priority_scores(_normalized(features, bounds)))
+    db.session.execute(db.insert(BidRanking), [row])
+
+    state.bid_count += 1
+    state.version = version
+
+
+def record_bid_withdrawn(bid):
+    """
+    Called before a bid is deleted. Removes its bid_ranking row and keeps
+    the state fresh when the bid did not sit on any feature bound.
+    """
+    version = bump_ranking_version(bid.project_id)
+
+    state = db.session.get(ProjectRankingState, bid.project_id)
+    row = db.session.get(BidRanking, bid.id)
+    if row is not None:
+        db.session.delete(row)
+
+    if state is None or state.version != version - 1 or row is None:
+        return
+
+    bounds = json.loads(state.bounds)
+    for k, (lo, hi) in bounds.items():
+        value = getattr(row, k)
+        on_bound = value == lo or value == hi
+        if on_bound and not (lo == hi and state.bid_count > 1):
+            return  # the bound may move; rebuilt on the next read
+
+    state.bid_count -= 1
+    state.version = version
+
+
+# --- Reads ---
+
+def _format_row(row, priority, bounds, options):
+    features = {k: row._mapping[k] for k in FEATURE_KEYS}
+    b_data = {
+        "bid": BidRow(row.bid_id, row.amount, row.proposal, row.proposed_timeline_days,
+                      row.freelancer_id, row.project_id),
+        "freelancer": RankedBidder(row.freelancer_id, row.username),
+        "features": features,
+    }
+    normalized = _normalized(features, bounds) if options["include_debug"] else None
+    return format_ranked_bid(
+        b_data, row._mapping[f"score_{priority}"], normalized, options["proposal_chars"]
+    )
+
+
+def _page_columns(source):
+    return [
+        *[getattr(source, k) for k in FEATURE_KEYS],
+        *[getattr(source, f"score_{p}") for p in PRIORITIES],
+        source.bid_id, source.project_id,
+        Bid.amount, Bid.proposal, Bid.proposed_timeline_days, Bid.freelancer_id,
+        User.username,
+    ]
+
+
+def read_rankings(wanted, options):
+    """
+    Reads ranking pages from the maintained state.
+    `wanted` is a list of (project_id, priority); `options` holds offset,
+    limit, include_debug and proposal_chars.
+    Returns {(project_id, priority): {"total_bids", "ranked_bids"}};
+    missing projects are absent.
+    """
+    projects = ensure_fresh_states([project_id for project_id, _ in wanted])
+    if not projects:
+        return {}
+
+    offset, limit = options["offset"], options["limit"]
+
+    by_priority = {}
+    for project_id, priority in wanted:
+        if project_id in projects:
+            key = priority if priority in SCORE_COLUMNS else "balanced"
+            by_priority.setdefault(key, set()).add(project_id)
+
+    pages = {}
+    for key, project_ids in by_priority.items():
+        order = (score_column(key).desc(), BidRanking.bid_id)
+
+        if len(project_ids) == 1:
+            # Single project: LIMIT/OFFSET straight off the priority index
+            query = (
+                db.select(*_page_columns(BidRanking))
+                .join(Bid, Bid.id == BidRanking.bid_id)
+                .where(BidRanking.project_id.in_(project_ids))
+                .order_by(*order)
+                .offset(offset)
+            )
+            if limit is not None:
+                query = query.limit(limit)
+        else:
+            # Several projects: number the rows per project in one query
+            ranked = db.select(
+                BidRanking,
+                db.func.row_number().over(
+                    partition_by=BidRanking.project_id, order_by=order
+                ).label("rank")
+            ).where(BidRanking.project_id.in_(project_ids)).subquery()
+            query = (
+                db.select(*_page_columns(ranked.c))
+                .join(Bid, Bid.id == ranked.c.bid_id)
+                .where(ranked.c.rank > offset)
+                .order_by(ranked.c.project_id, ranked.c.rank)
+            )
+            if limit is not None:
+                query = query.where(ranked.c.rank <= offset + limit)
+
+        query = query.join(User, User.id == Bid.freelancer_id)
+        for row in db.session.execute(query):
+            pages.setdefault((row.project_id, key), []).append(row)
+
+    results = {}
+    for project_id, priority in wanted:
+        if project_id not in projects:
+            continue
+        key = priority if priority in SCORE_COLUMNS else "balanced"
+        project = projects[project_id]
+        bounds = json.loads(project.bounds) if options["include_debug"] else None
+        results[(project_id, priority)] = {
+            "total_bids": project.bid_count,
+            "ranked_bids": [
+                _format_row(row, key, bounds, options)
+                for row in pages.get((project_id, key), [])
+            ],
+        }
+    return results
@@ -0,0 +1,80 @@
+# Vectorized (NumPy) scoring engine for bid ranking.
+# Produces the same scores as ranking_logic.score_bids(), but normalizes,
+# weights and orders all bids with array operations instead of per-bid
+# Python loops. Selected with RANKING_ENGINE = "numpy".
+
+import numpy as np
+
+from app.ranking_logic import (
+    FEATURE_KEYS,
+    INVERTED_FEATURES,
+    ScoredBids,
+    adjust_weights_for_priority,
+)
+
+# Boolean mask over FEATURE_KEYS marking the inverted columns
+_INVERTED_MASK = np.array([k in INVERTED_FEATURES for k in FEATURE_KEYS])
+
+
+def build_feature_matrix(per_bid_data):
+    """Packs the per-bid feature dicts into an (n_bids, n_features) matrix."""
+    return np.array(
+        [[b["features"][k] for k in FEATURE_KEYS] for b in per_bid_data],
+        dtype=np.float64
+    ).reshape(len(per_bid_data), len(FEATURE_KEYS))
+
+
+def normalize_feature_matrix(matrix):
+    """
+    Column-wise Min-Max scaling, matching normalize_feature_list():
+    inverted columns become 1 - scaled, constant columns become 0.5.
+    """
+    lo = matrix.min(axis=0)
+    hi = matrix.max(axis=0)
+    span = hi - lo
+    constant = span == 0
+
+    # Avoid dividing by zero; constant columns are overwritten below
+    scaled = (matrix - lo) / np.where(constant, 1.0, span)
+    scaled = np.where(_INVERTED_MASK, 1.0 - scaled, scaled)
+    scaled[:, constant] = 0.5
+    return scaled
+
+
+class VectorScoredBids(ScoredBids):
+    """ScoredBids backed by NumPy arrays; selects pages with argpartition."""
+
+    def top_indices(self, offset=0, limit=None):
+        # Sort key: descending rounded score, ties in input order
+        keys = -np.round(self.scores, 4)
+        n = len(keys)
+
+        if limit is None or offset + limit >= n:
+            candidates = np.arange(n)
+        else:
+            k = offset + limit
+            kth = np.partition(keys, k - 1)[k - 1]
+            better = np.flatnonzero(keys < kth)
+            ties = np.flatnonzero(keys == kth)[:k - len(better)]
+            candidates = np.concatenate([better, ties])
+
+        order = candidates[np.lexsort((candidates, keys[candidates]))]
+        end = None if limit is None else offset + limit
+        return order[offset:end].tolist()
+
+    def normalized_features(self, i):
+        return dict(zip(FEATURE_KEYS, self.normalized[i].tolist()))
+
+
+def score_bids_vectorized(per_bid_data, priority='balanced'):
+    """
+    NumPy scoring engine. Takes the output of collect_bid_features()
+    and returns a VectorScoredBids with the same scores as score_bids().
+    """
+    weights = adjust_weights_for_priority(priority)
+    weight_vector = np.array([weights[k] for k in FEATURE_KEYS])
+
+    normalized = normalize_feature_matrix(build_feature_matrix(per_bid_data))
+    scores = normalized @ weight_vector
+
+    return VectorScoredBids(per_bid_data, weights, scores, normalized)
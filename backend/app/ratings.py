@@ -0,0 +1,82 @@
+# Running rating aggregates.
+# Every freelancer keeps the sum and count of the ratings they received and
+# a per-star histogram (rating_1 .. rating_5). A new review updates them
+# with one SQL increment in the review's own transaction, so the cost does
+# not grow with the number of reviews and concurrent reviews cannot lose an
+# update. avg_rating is derived from the aggregates in the same statement.
+# Reviews of clients are stored but leave the client's aggregates alone.
+
+
+from app import db
+from app.models import User, Review, Project
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+
+HISTOGRAM_COLUMNS = {star: getattr(User, f"rating_{star}") for star in RATING_VALUES}
+
+
+def _average(rating_sum, rating_count):
+    return db.func.round(db.cast(rating_sum, db.Float) / rating_count, 2)
+
+
+def record_rating(user_id, rating):
+    """
+    Adds one received rating (1-5) to a user's aggregates. Runs in the
+    caller's transaction; the caller commits.
+    """
+    db.session.execute(
+        db.update(User)
+        .where(User.id == user_id)
+        .values({
+            User.rating_sum: User.rating_sum + rating,
+            User.rating_count: User.rating_count + 1,
+            HISTOGRAM_COLUMNS[rating]: HISTOGRAM_COLUMNS[rating] + 1,
+            # SET expressions see the old row, so apply the increment here too
+            User.avg_rating: _average(User.rating_sum + rating, User.rating_count + 1),
+        }),
+        execution_options={"synchronize_session": False}
+    )
+    # Let ORM reads in this session see the new values (if it is loaded)
+    user = db.session.identity_map.get(db.session.identity_key(User, user_id))
+    if user is not None:
+        db.session.expire(user, ["rating_sum", "rating_count", f"rating_{rating}", "avg_rating"])
+
+
+def rebuild_rating_aggregates():
+    """
+    Recomputes every freelancer's aggregates from the review table with
+    one GROUP BY (backfill/repair). avg_rating is rewritten for reviewed users
+    only, so imported external ratings of users without reviews are kept.
+    Every ranking is invalidated, since ratings feed it. Commits.
+    Returns the number of reviewed freelancers.
+    """
+    rows = db.session.execute(
+        db.select(
+            Review.reviewee_id,
+            db.func.sum(Review.rating).label("rating_sum"),
+            db.func.count().label("rating_count"),
+            *[
+                db.func.sum(db.case((Review.rating == star, 1), else_=0)).label(f"rating_{star}")
+                for star in RATING_VALUES
+            ]
+        )
+        .join(User, User.id == Review.reviewee_id)
+        .where(User.is_freelancer.is_(True))
+        .group_by(Review.reviewee_id)
+    ).all()
+
+    zero = {"rating_sum": 0, "rating_count": 0, **{f"rating_{star}": 0 for star in RATING_VALUES}}
+    db.session.execute(db.update(User).values(**zero), execution_options={"synchronize_session": False})
+    if rows:
+        db.session.execute(db.update(User), [
+            {
+                "id": row.reviewee_id,
+                **{k: row._mapping[k] for k in zero},
+                "avg_rating": round(row.rating_sum / row.rating_count, 2),
+            }
+            for row in rows
+        ])
+
+    db.session.execute(db.update(Project).values(ranking_version=Project.ranking_version + 1))
+    db.session.commit()
+    return len(rows)
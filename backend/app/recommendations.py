@@ -0,0 +1,119 @@
+# Skill-based discovery in both directions:
+# - recommend_projects(): open projects for a freelancer (project_skill index)
+# - find_candidates(): freelancers for a project (user_skill index)
+# Only the posting lists of the given skills are read, so the cost is
+# bounded by those lists, not by the number of projects or users. Skill
+# overlap is the same notion ranking_logic uses for bids (Jaccard, or the
+# IDF cosine in SKILL_MATCH_MODE = "idf" for candidates).
+
+import heapq
+from collections import namedtuple
+
+from sqlalchemy.orm import selectinload
+
+from app import db
+from app.models import User, Project, ProjectSkill, UserSkill, decode_skill_vector
+from app.ranking_logic import (
+    BASE_WEIGHTS,
+    compute_freelancer_features,
+    normalize_feature_list,
+    skill_match_mode,
+)
+from app.skills import skill_ids_from_mask
+
+# Ranking columns of a candidate freelancer (attribute names match User)
+CandidateRow = namedtuple(
+    "CandidateRow",
+    ["id", "username", "avg_rating", "completion_rate", "on_time_rate",
+     "portfolio_score", "skills", "skill_mask", "skill_weights"]
+)
+
+# Bid-independent features and their share of BASE_WEIGHTS, re-normalized
+CANDIDATE_FEATURES = ("rating", "completion_rate", "on_time_rate", "portfolio_score", "skill_match")
+_candidate_total = sum(BASE_WEIGHTS[k] for k in CANDIDATE_FEATURES)
+CANDIDATE_WEIGHTS = {k: BASE_WEIGHTS[k] / _candidate_total for k in CANDIDATE_FEATURES}
+
+
+def recommend_projects(user, offset=0, limit=20):
+    """
+    Returns [(project, skill_match)] for the open projects sharing at least
+    one skill with `user`, best match first (newest first on ties).
+    """
+    skill_ids = skill_ids_from_mask(user.skill_mask or 0)
+    if not skill_ids:
+        return []
+
+    # |project ∩ freelancer| per candidate, straight from the posting lists
+    overlap = (
+        db.select(ProjectSkill.project_id, db.func.count().label("overlap"))
+        .where(ProjectSkill.skill_id.in_(skill_ids), ProjectSkill.is_open.is_(True))
+        .group_by(ProjectSkill.project_id)
+        .subquery()
+    )
+
+    # Jaccard = |A ∩ B| / (|A| + |B| - |A ∩ B|)
+    skill_match = (
+        db.cast(overlap.c.overlap, db.Float)
+        / (Project.skill_count + len(skill_ids) - overlap.c.overlap)
+    ).label("skill_match")
+
+    rows = db.session.execute(
+        db.select(Project, skill_match)
+        .join(overlap, overlap.c.project_id == Project.id)
+        .options(selectinload(Project.client))
+        .order_by(skill_match.desc(), Project.created_at.desc(), Project.id.desc())
+        .offset(offset)
+        .limit(limit)
+    ).all()
+    return [(project, round(score, 4)) for project, score in rows]
+
+
+def find_candidates(project, limit=20):
+    """
+    Returns the top `limit` freelancers for a project as
+    [(candidate_row, score, features)], best first. Candidates are the
+    freelancers sharing at least one required skill; they are scored with
+    the bid-independent ranking features, min-max normalized across the
+    candidate set and weighted like BASE_WEIGHTS.
+    """
+    skill_ids = skill_ids_from_mask(project.skill_mask or 0)
+    if not skill_ids:
+        return []
+
+    candidate_ids = (
+        db.select(UserSkill.user_id)
+        .where(UserSkill.skill_id.in_(skill_ids))
+        .distinct()
+        .subquery()
+    )
+    rows = db.session.execute(
+        db.select(
+            User.id, User.username, User.avg_rating, User.completion_rate,
+            User.on_time_rate, User.portfolio_score, User.skills, User.skill_bits,
+            User.skill_vector
+        )
+        .join(candidate_ids, candidate_ids.c.user_id == User.id)
+        .where(User.id != project.client_id)
+    ).all()
+    if not rows:
+        return []
+
+    candidates = [
+        CandidateRow(*row[:-2], int.from_bytes(row.skill_bits or b'', 'little'),
+                     decode_skill_vector(row.skill_vector))
+        for row in rows
+    ]
+    skill_mode = skill_match_mode()
+    features = [compute_freelancer_features(c, project, skill_mode) for c in candidates]
+
+    normalized = {
+        k: normalize_feature_list([f[k] for f in features])
+        for k in CANDIDATE_FEATURES
+    }
+    scores = [
+        sum(CANDIDATE_WEIGHTS[k] * normalized[k][i] for k in CANDIDATE_FEATURES)
+        for i in range(len(candidates))
+    ]
+
+    top = heapq.nlargest(limit, range(len(candidates)), key=lambda i: (scores[i], -candidates[i].id))
+    return [(candidates[i], round(scores[i], 4), features[i]) for i in top]
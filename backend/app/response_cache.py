@@ -0,0 +1,241 @@
+# Response cache for the public read endpoints (GET /projects,
+# /project/<id>, /project/<id>/bids and /user/<id>).
+# Finished 200 responses are stored by path and query string for
+# RESPONSE_CACHE_TTL seconds. Each entry carries tags naming the rows it
+# shows (project:<id>, user:<id>), the profile lists it contains
+# (profile:<id>) and, for listings, the open-project listing (projects).
+# Mutation routes call invalidate() with the tags they touched after they
+# commit; an entry stored before the newest invalidation of one of its
+# tags is treated as a miss, so exactly the affected responses go stale
+# without the cache having to know their keys.
+# Storage is pluggable (RESPONSE_CACHE_BACKEND): "memory" (default, per
+# process), "disk" (shared by every worker, app/disk_cache.py) or the
+# dotted path of a class taking the app.
+
+import time
+from functools import wraps
+from threading import Lock
+from urllib.parse import urlencode
+
+from flask import g, make_response, request
+from werkzeug.utils import import_string
+
+from app.cache import TTLCache
+
+LISTING_TAG = "projects"
+
+
+def project_tag(project_id):
+    return f"project:{project_id}"
+
+
+def user_tag(user_id):
+    return f"user:{user_id}"
+
+
+def profile_tag(user_id):
+    return f"profile:{user_id}"
+
+
+class MemoryBackend:
+    """
+    In-process backend: a TTLCache of entries plus the last invalidation
+    time of every tag. Tag times older than the TTL cannot affect a live
+    entry and are pruned.
+    """
+
+    def __init__(self, app):
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', 30)
+        self.entries = TTLCache(maxsize=app.config.get('RESPONSE_CACHE_SIZE', 512), ttl=self.ttl)
+        self._tags = {}
+        self._prune_at = 1024
+        self._lock = Lock()
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, entry):
+        self.entries.set(key, entry)
+
+    def delete(self, key):
+        self.entries.delete(key)
+
+    def invalidate(self, tags, at):
+        with self._lock:
+            for tag in tags:
+                self._tags[tag] = at
+            if len(self._tags) > self._prune_at:
+                horizon = at - self.ttl
+                self._tags = {t: when for t, when in self._tags.items() if when >= horizon}
+                self._prune_at = max(1024, 2 * len(self._tags))
+
+    def invalidated_since(self, tags, since):
+        with self._lock:
+            return any(self._tags.get(tag, 0) >= since for tag in tags)
+
+    def clear(self):
+        self.entries.clear()
+        with self._lock:
+            self._tags.clear()
+
+    def stats(self):
+        stats = self.entries.stats()
+        with self._lock:
+            stats["tags"] = len(self._tags)
+        return stats
+
+
+class DiskBackend:
+    """
+    Backend shared by every worker on the host: entries and tag
+    invalidation times live in the disk cache, so an invalidation in one
+    worker is seen by all of them. Tag times are never evicted for space
+    (only expired after the TTL), since a lost one could revive stale entries.
+    """
+
+    def __init__(self, app):
+        from app.disk_cache import DiskCache, app_namespace, disk_store
+        store = disk_store(app)
+        ttl = app.config.get('RESPONSE_CACHE_TTL', 30)
+        self.entries = DiskCache(store, app_namespace(app, "responses"), ttl=ttl)
+        self._tags = DiskCache(store, app_namespace(app, "response_tags"), ttl=ttl)
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, entry):
+        self.entries.set(key, entry)
+
+    def delete(self, key):
+        self.entries.delete(key)
+
+    def invalidate(self, tags, at):
+        for tag in tags:
+            self._tags.set(tag, at, evictable=False)
+
+    def invalidated_since(self, tags, since):
+        return any(at >= since for at in self._tags.get_many(tags).values())
+
+    def clear(self):
+        self.entries.clear()
+        self._tags.clear()
+
+    def stats(self):
+        stats = self.entries.stats()
+        stats["tags"] = self._tags.stats().get("entries")
+        return stats
+
+
+BACKENDS = {"memory": MemoryBackend, "disk": DiskBackend}
+
+
+class ResponseCache:
+    """
+    Flask extension. Views opt in with @response_cache.cached and declare
+    what they show with response_cache.tag(...); a view that declares no
+    tags is never stored. RESPONSE_CACHE_TTL = 0 disables the cache.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self.enabled = False
+        self._lock = Lock()
+        self._reset_counters()
+
+    def init_app(self, app):
+        self.enabled = app.config.get('RESPONSE_CACHE_TTL', 30) > 0
+        name = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+        backend_class = BACKENDS.get(name) or import_string(name)
+        self.backend = backend_class(app)
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.hits = self.misses = self.stale = self.stores = self.invalidations = 0
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @staticmethod
+    def request_key():
+        """Path plus the query parameters in a canonical order."""
+        args = sorted(request.args.items(multi=True))
+        return f"{request.path}?{urlencode(args)}" if args else request.path
+
+    def tag(self, *tags):
+        """Declares what the current response shows (see module comment)."""
+        g.setdefault("response_cache_tags", set()).update(tags)
+
+    def invalidate(self, *tags):
+        """Marks every cached response with one of `tags` stale. Call after committing."""
+        if self.enabled and tags:
+            self.backend.invalidate(tags, time.time())
+            self._count("invalidations")
+
+    def cached(self, view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return view(*args, **kwargs)
+
+            key = self.request_key()
+            entry = self.backend.get(key)
+            if entry is not None and self.backend.invalidated_since(entry["tags"], entry["stored_at"]):
+                self.backend.delete(key)
+                self._count("stale")
+                entry = None
+
+            if entry is not None:
+                from app.conditional import not_modified
+                self._count("hits")
+                validators = entry["validators"]
+                response = (not_modified(validators) if validators else None) or make_response(
+                    entry["body"], entry["status"], entry["headers"]
+                )
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            self._count("misses")
+            # Anything committed after this instant invalidates the entry
+            started_at = time.time()
+            g.pop("response_cache_tags", None)
+            response = make_response(view(*args, **kwargs))
+            tags = g.pop("response_cache_tags", None)
+            if response.status_code == 200 and tags:
+                self.backend.set(key, {
+                    "status": response.status_code,
+                    "body": response.get_data(),
+                    "headers": [(k, v) for k, v in response.headers.items() if k != "Content-Length"],
+                    "validators": _validators_of(response),
+                    "tags": sorted(tags),
+                    "stored_at": started_at,
+                })
+                self._count("stores")
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "stores": self.stores,
+                "invalidations": self.invalidations,
+            }
+        stats["backend"] = self.backend.stats()
+        return stats
+
+
+def _validators_of(response):
+    from app.conditional import Validators
+    etag, _ = response.get_etag()
+    if etag is None:
+        return None
+    last_modified = response.last_modified
+    return Validators(etag, last_modified.replace(tzinfo=None) if last_modified else None)
@@ -1,11 +1,62 @@
-from flask import Blueprint, request, jsonify
-from app import db
+from flask import Blueprint, request, jsonify, current_app, abort
+from app import db, ranking_cache, ranking_jobs, response_cache, external_cache
 from app.models import User, Project, Bid, Review
-from app.schemas import UserSchema, ProjectSchema, BidSchema, ReviewSchema
+from app.schemas import UserSchema, ProjectSchema, ProjectCardSchema, BidSchema, ReviewSchema
 from werkzeug.security import generate_password_hash
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from sqlalchemy import or_
-from app.ranking_logic import calculate_ranked_bids
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only, selectinload
+from app.ranking_logic import adjust_weights_for_priority
+from app.ranking_data import (
+    load_ranking_heads,
+    bump_ranking_version,
+    bump_ranking_versions_for_bidder,
+)
+from app.ranking_state import read_rankings, record_bid_placed, record_bid_withdrawn
+from app.skills import (
+    open_projects_with_skills,
+    parse_skills,
+    set_project_skills,
+    set_user_skills,
+    sync_project_open_state,
+)
+from app.recommendations import recommend_projects, find_candidates
+from app.pagination import encode_cursor, decode_cursor, keyset_page
+from app.search import search_projects, search_terms
+from app.ratings import RATING_VALUES, record_rating
+from app.conditional import (
+    conditional,
+    make_validators,
+    not_modified,
+    project_graph_validators,
+    rows_validators,
+)
+from app.response_cache import LISTING_TAG, profile_tag, project_tag, user_tag
+from app.fieldsets import (
+    PROFILE_INCLUDES,
+    PROJECT_FIELDS,
+    PROJECT_INCLUDES,
+    Fieldset,
+    fieldset_schema,
+    parse_fieldset,
+)
+from app.profiles import (
+    MAX_PROFILE_PAGE_SIZE,
+    PROFILE_PAGE_SIZE,
+    projects_key,
+    received_reviews_page,
+    user_projects_page,
+)
+from app.bid_listing import (
+    BID_PAGE_SIZE,
+    BID_SORTS,
+    MAX_BID_PAGE_SIZE,
+    decode_bid_cursor,
+    encode_bid_cursor,
+    project_bids_page,
+)
+from app.bulk import ingest_bids, ingest_projects
 from app.external.freelancer import fetch_freelancer_rating
 from app.models import ExternalProfile
 from datetime import datetime, timedelta
@@ -16,10 +67,18 @@ user_schema = UserSchema()
 users_schema = UserSchema(many=True)
 project_schema = ProjectSchema()
 projects_schema = ProjectSchema(many=True)
+project_card_schema = ProjectCardSchema()
+project_cards_schema = ProjectCardSchema(many=True)
 bid_schema = BidSchema()
 bids_schema = BidSchema(many=True)
 review_schema = ReviewSchema()
 reviews_schema = ReviewSchema(many=True)
+# Profiles list reviews of one user, so the reviewee is left out
+profile_reviews_schema = ReviewSchema(many=True, exclude=("reviewee",))
+# Reviews are paginated separately (app/profiles.py)
+profile_user_schema = UserSchema(exclude=("reviews_received",))
+# Attributes a profile can be narrowed to with ?fields=
+USER_FIELDS = tuple(profile_user_schema.dump_fields)
 
 # Create Blueprint
 api_bp = Blueprint('api', __name__)
@@ -30,22 +89,15 @@ def get_user_from_jwt():
     user_id = get_jwt_identity()
     return User.query.get(user_id)
 
-def update_user_ranking(user_id):
-    """Recalculates and updates a user's average rating score."""
-    user = User.query.get(user_id)
-    if not user:
-        return
-
-    reviews = user.reviews_received.all()
-    if not reviews:
-        # Use avg_rating from new model
-        user.avg_rating = 0.0
-    else:
-        total_rating = sum(r.rating for r in reviews)
-        # Use avg_rating from new model
-        user.avg_rating = round(total_rating / len(reviews), 2)
+def update_user_ranking(user_id, rating):
+    """
+    Adds a received rating to the user's running aggregates and average
+    (app/ratings.py). Runs in the caller's transaction; the caller commits.
+    """
+    record_rating(user_id, rating)
 
-    db.session.commit()
+    # The rating feeds the ranking of every project this user bid on
+    bump_ranking_versions_for_bidder(user_id)
 
 # --- Authentication Routes ---
 
@@ -83,34 +135,94 @@ def login():
 
 # --- User Routes ---
 
+def profile_page_limit():
+    return max(1, min(request.args.get('limit', PROFILE_PAGE_SIZE, type=int), MAX_PROFILE_PAGE_SIZE))
+
+def render_profile(user):
+    """
+    The profile shared by GET /user/<id> and GET /user/profile: the user,
+    the latest reviews they received and their latest projects (accepted
+    for a freelancer, posted for a client). `limit` sets the page size;
+    the rest is fetched from /user/<id>/reviews and /user/<id>/projects
+    with reviews_next_cursor / projects_next_cursor.
+    ?fields= narrows the user attributes and ?include=reviews,projects
+    picks the lists (both by default); a left-out list is not queried.
+    """
+    try:
+        fieldset = parse_fieldset(USER_FIELDS, PROFILE_INCLUDES, default_includes=PROFILE_INCLUDES)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    limit = profile_page_limit()
+    reviews, next_review = [], None
+    if 'reviews' in fieldset.includes:
+        reviews, next_review = received_reviews_page(user.id, limit=limit)
+    projects, next_project = [], None
+    if 'projects' in fieldset.includes:
+        projects, next_project = user_projects_page(user, limit=limit)
+
+    # The pages are small, so the validators come from the loaded rows;
+    # only serialization is skipped for an unchanged profile
+    validators = rows_validators(
+        [user, *reviews, *(r.reviewer for r in reviews), *projects, *(p.client for p in projects)],
+        extra=(next_review, next_project, fieldset),
+    )
+    cached = not_modified(validators)
+    if cached:
+        return cached
+
+    response_cache.tag(
+        user_tag(user.id), profile_tag(user.id),
+        *(user_tag(r.reviewer_id) for r in reviews),
+        *(project_tag(p.id) for p in projects),
+        *(user_tag(p.client_id) for p in projects),
+    )
+    user_data = fieldset_schema(UserSchema, Fieldset(fieldset.fields, ())).dump(user)
+    if 'reviews' in fieldset.includes:
+        user_data['reviews_received'] = profile_reviews_schema.dump(reviews)
+        user_data['reviews_next_cursor'] = encode_cursor(*next_review) if next_review else None
+    if 'projects' in fieldset.includes:
+        user_data[projects_key(user)] = project_cards_schema.dump(projects)
+        user_data['projects_next_cursor'] = encode_cursor(*next_project) if next_project else None
+
+    return conditional((jsonify(user_data), 200), validators)
+
+def profile_cursor():
+    """Decoded ?cursor= of a profile list (None for the first page); raises ValueError."""
+    cursor = request.args.get('cursor')
+    return decode_cursor(cursor, datetime.fromisoformat, int) if cursor else None
+
 @api_bp.route('/user/<int:id>', methods=['GET'])
+@response_cache.cached
 def get_user_profile(id):
     user = User.query.get_or_404(id)
+    return render_profile(user)
 
-    # First, dump the main user data (bio, skills, etc.)
-    user_data = user_schema.dump(user)
-
-    # Now, manually query the dynamic relationships and serialize them
-    if user.is_freelancer:
-        # Get projects where this freelancer's bid was accepted
-        accepted_projects = (
-            Project.query
-            .join(Bid, Project.accepted_bid_id == Bid.id)
-            .filter(Bid.freelancer_id == user.id)
-            .order_by(Project.created_at.desc())
-            .all()
-        )
-        user_data['accepted_projects'] = projects_schema.dump(accepted_projects)
-    else:
-        # Get projects posted *by* this client
-        posted_projects = user.projects_as_client.order_by(Project.created_at.desc()).all()
-        user_data['posted_projects'] = projects_schema.dump(posted_projects)
+@api_bp.route('/user/<int:id>/reviews', methods=['GET'])
+def get_user_reviews(id):
+    """Next pages of a profile's reviews; X-Next-Cursor is absent on the last page."""
+    User.query.get_or_404(id)
+    try:
+        after = profile_cursor()
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
 
-    # Get reviews *received by* this user
-    reviews_received = user.reviews_received.order_by(Review.created_at.desc()).all()
-    user_data['reviews_received'] = reviews_schema.dump(reviews_received)
+    reviews, next_key = received_reviews_page(id, after, profile_page_limit())
+    headers = {"X-Next-Cursor": encode_cursor(*next_key)} if next_key else {}
+    return jsonify(profile_reviews_schema.dump(reviews)), 200, headers
 
-    return jsonify(user_data), 200
+@api_bp.route('/user/<int:id>/projects', methods=['GET'])
+def get_user_projects(id):
+    """Next pages of a profile's accepted (freelancer) or posted (client) projects."""
+    user = User.query.get_or_404(id)
+    try:
+        after = profile_cursor()
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+
+    projects, next_key = user_projects_page(user, after, profile_page_limit())
+    headers = {"X-Next-Cursor": encode_cursor(*next_key)} if next_key else {}
+    return jsonify(project_cards_schema.dump(projects)), 200, headers
 
 @api_bp.route('/user/profile', methods=['GET', 'PUT'])
 @jwt_required()
@@ -118,35 +230,19 @@ def my_profile():
     user = get_user_from_jwt()
 
     if request.method == 'GET':
-        user_data = user_schema.dump(user)
-
-        if user.is_freelancer:
-            # Get projects where this freelancer's bid was accepted
-            accepted_projects = (
-                Project.query
-                .join(Bid, Project.accepted_bid_id == Bid.id)
-                .filter(Bid.freelancer_id == user.id)
-                .order_by(Project.created_at.desc())
-                .all()
-            )
-            user_data['accepted_projects'] = projects_schema.dump(accepted_projects)
-        else:
-            posted_projects = user.projects_as_client.order_by(Project.created_at.desc()).all()
-            user_data['posted_projects'] = projects_schema.dump(posted_projects)
-
-        reviews_received = user.reviews_received.order_by(Review.created_at.desc()).all()
-        user_data['reviews_received'] = reviews_schema.dump(reviews_received)
-
-        return jsonify(user_data), 200
+        return render_profile(user)
 
     if request.method == 'PUT':
         data = request.get_json()
         user.bio = data.get('bio', user.bio)
-        user.skills = data.get('skills', user.skills)
+        if 'skills' in data and data['skills'] != user.skills:
+            set_user_skills(user, data['skills'])
+            bump_ranking_versions_for_bidder(user.id)
         if 'password' in data:
             user.set_password(data['password'])
 
         db.session.commit()
+        response_cache.invalidate(user_tag(user.id))
         return user_schema.dump(user), 200
     
 @api_bp.route("/user/import_freelancer_rating", methods=["POST"])
@@ -175,10 +271,15 @@ def import_freelancer_rating():
             "reviews": existing.reviews
         }), 200
 
-    # Fetch new data
-    result = fetch_freelancer_rating(freelancer_name)
-    if not result:
-        return jsonify({"error": "Unable to fetch profile"}), 502
+    # Fetch new data (shared lookup cache first: the same Freelancer.com
+    # profile is scraped once per EXTERNAL_CACHE_TTL, not once per user)
+    lookup_key = ("freelancer", freelancer_name.lower())
+    result = external_cache.get(lookup_key)
+    if result is None:
+        result = fetch_freelancer_rating(freelancer_name)
+        if not result:
+            return jsonify({"error": "Unable to fetch profile"}), 502
+        external_cache.set(lookup_key, result)
 
     # Upsert external profile
     if not existing:
@@ -197,8 +298,10 @@ def import_freelancer_rating():
     # Auto-update user's rating **ONLY** if Zero/None
     if result["rating"] and (not user.avg_rating or user.avg_rating == 0.0):
         user.avg_rating = float(result["rating"])
+        bump_ranking_versions_for_bidder(user.id)
 
     db.session.commit()
+    response_cache.invalidate(user_tag(user.id))
 
     return jsonify({
         "ok": True,
@@ -210,26 +313,178 @@ def import_freelancer_rating():
 
 # --- Project Routes ---
 
+def project_graph_loaders(includes=PROJECT_INCLUDES):
+    """
+    Loader options for the relations ProjectSchema serializes (client,
+    freelancer, bids with their freelancer, reviews with both users), so
+    dumping any number of projects takes a fixed number of queries.
+    Relations not in `includes` are not loaded at all.
+    """
+    loaders = []
+    if 'client' in includes:
+        loaders.append(selectinload(Project.client))
+    if 'freelancer' in includes:
+        loaders.append(selectinload(Project.freelancer))
+    if 'bids' in includes:
+        loaders.append(selectinload(Project.bids).selectinload(Bid.freelancer))
+    if 'reviews' in includes:
+        loaders.append(selectinload(Project.reviews).selectinload(Review.reviewer))
+        loaders.append(selectinload(Project.reviews).selectinload(Review.reviewee))
+    return tuple(loaders)
+
+def project_loader_options(fieldset):
+    """Loads only the columns and relations `fieldset` shows (plus the keys)."""
+    columns = set(fieldset.fields) | {'id', 'created_at'}
+    if 'client' in fieldset.includes:
+        columns.add('client_id')
+    if 'freelancer' in fieldset.includes:
+        columns.add('freelancer_id')
+    return (
+        load_only(*(getattr(Project, name) for name in sorted(columns))),
+        *project_graph_loaders(fieldset.includes),
+    )
+
+def project_graph_tags(projects, includes=PROJECT_INCLUDES):
+    """Response cache tags of everything ProjectSchema shows for `projects`."""
+    tags = set()
+    for project in projects:
+        tags.add(project_tag(project.id))
+        if 'client' in includes:
+            tags.add(user_tag(project.client_id))
+        if 'freelancer' in includes and project.freelancer_id:
+            tags.add(user_tag(project.freelancer_id))
+        if 'bids' in includes:
+            tags.update(user_tag(bid.freelancer_id) for bid in project.bids)
+        if 'reviews' in includes:
+            for review in project.reviews:
+                tags.update((user_tag(review.reviewer_id), user_tag(review.reviewee_id)))
+    return tags
+
 @api_bp.route('/projects', methods=['GET'])
+@response_cache.cached
 def get_projects():
+    """
+    Open projects, newest first, one page at a time.
+    Query params: limit (default 20, max 100), cursor (from the previous
+    page's X-Next-Cursor header), min_budget, max_budget, client_id, and
+    skill (repeat it or comma-separate it for several skills; match=all
+    requires every skill, the default match=any at least one).
+    Each project is a lean card (its own fields and the client) unless
+    ?include= asks for more (client, freelancer, bids, reviews);
+    ?fields= narrows the project attributes.
+    The body stays a plain list; X-Next-Cursor is absent on the last page.
+    """
     try:
-        # Logic to filter by skill query if provided
-        skill_query = request.args.get('skill')
-
-        query = Project.query.filter_by(status='open')
+        limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+        try:
+            fieldset = parse_fieldset(PROJECT_FIELDS, PROJECT_INCLUDES, default_includes=('client',))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        min_budget = request.args.get('min_budget', type=float)
+        max_budget = request.args.get('max_budget', type=float)
+        client_id = request.args.get('client_id', type=int)
+
+        cursor = request.args.get('cursor')
+        try:
+            after = decode_cursor(cursor, datetime.fromisoformat, int) if cursor else None
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
 
-        if skill_query:
-            # Simple 'like' search. 
-            # Note: Your model.py has 'required_skills' which is what we should search
-            query = query.filter(Project.required_skills.like(f"%{skill_query}%"))
-
-        projects = query.order_by(Project.created_at.desc()).all()
-        return projects_schema.dump(projects), 200
+        # Logic to filter by skill query if provided
+        skill_names = parse_skills(','.join(request.args.getlist('skill')))
+        match_all = request.args.get('match', 'any').lower() == 'all'
+
+        query = db.select(Project).where(Project.status == 'open')
+        if min_budget is not None:
+            query = query.where(Project.budget >= min_budget)
+        if max_budget is not None:
+            query = query.where(Project.budget <= max_budget)
+        if client_id is not None:
+            query = query.where(Project.client_id == client_id)
+
+        if skill_names:
+            # Exact skill matches from the project_skill index
+            matching = open_projects_with_skills(skill_names, match_all)
+            if matching is None:
+                return jsonify([]), 200
+            query = query.where(Project.id.in_(matching))
+
+        # Keyset pagination on (created_at, id): every page is a range scan
+        # of ix_project_status_created. Only the keys are read at first, so
+        # an unchanged page is answered without loading the project graph.
+        page, next_key = keyset_page(
+            query.options(load_only(Project.id, Project.created_at)),
+            (Project.created_at, Project.id), after, limit
+        )
+        ids = [p.id for p in page]
+        validators = (project_graph_validators(ids, extra=(next_key, fieldset))
+                      or make_validators(((), next_key, fieldset), ()))
+        cached = not_modified(validators)
+        if cached:
+            return cached
+
+        loaded = db.session.execute(
+            db.select(Project)
+            .where(Project.id.in_(ids))
+            .options(*project_loader_options(fieldset))
+            .execution_options(populate_existing=True)
+        ).scalars().all()
+        by_id = {p.id: p for p in loaded}
+        projects = [by_id[i] for i in ids if i in by_id]
+
+        response_cache.tag(LISTING_TAG, *project_graph_tags(projects, fieldset.includes))
+        headers = {"X-Next-Cursor": encode_cursor(*next_key)} if next_key else {}
+        body = fieldset_schema(ProjectSchema, fieldset, many=True).dump(projects)
+        return conditional((body, 200, headers), validators)
 
     except Exception as e:
         print(f"Error in /api/projects: {e}")
         return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500
 
+@api_bp.route('/projects/recommended', methods=['GET'])
+@jwt_required()
+def recommended_projects():
+    """
+    Open projects ranked by skill overlap with the logged-in freelancer.
+    Query params: limit (default 20, max 100), offset.
+    """
+    user = get_user_from_jwt()
+    if not user.is_freelancer:
+        return jsonify({"msg": "Only freelancers get project recommendations"}), 403
+
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    offset = max(0, request.args.get('offset', 0, type=int))
+
+    projects = []
+    for project, skill_match in recommend_projects(user, offset, limit):
+        card = project_card_schema.dump(project)
+        card['skill_match'] = skill_match
+        projects.append(card)
+
+    return jsonify(projects=projects, offset=offset, limit=limit), 200
+
+@api_bp.route('/projects/search', methods=['GET'])
+def search_open_projects():
+    """
+    Full-text search over open projects' title, description and required
+    skills, most relevant first.
+    Query params: q (required), limit (default 20, max 100), offset.
+    """
+    q = request.args.get('q', '')
+    if not search_terms(q):
+        return jsonify({"error": "q is required"}), 400
+
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    offset = max(0, request.args.get('offset', 0, type=int))
+
+    projects = []
+    for project, score in search_projects(q, offset, limit):
+        card = project_card_schema.dump(project)
+        card['score'] = score
+        projects.append(card)
+
+    return jsonify(projects=projects, offset=offset, limit=limit), 200
+
 @api_bp.route('/projects', methods=['POST'])
 @jwt_required()
 def create_project():
@@ -240,19 +495,142 @@ def create_project():
         title=data['title'],
         description=data['description'],
         budget=data['budget'],
-        client_id=user.id,
-        # Add required_skills from new model
-        required_skills=data.get('required_skills')
+        client_id=user.id
     )
+    # Add required_skills from new model (keeps the skill bitset in sync)
+    set_project_skills(new_project, data.get('required_skills'))
 
     db.session.add(new_project)
     db.session.commit()
+    response_cache.invalidate(LISTING_TAG, profile_tag(user.id))
     return project_schema.dump(new_project), 201
 
+def bulk_items(key):
+    """The request's `key` list, or (None, error response) if it is not a usable batch."""
+    items = (request.get_json(silent=True) or {}).get(key)
+    if not isinstance(items, list) or not items:
+        return None, (jsonify({"error": f"{key} must be a non-empty list"}), 400)
+    max_items = current_app.config.get('BULK_MAX_ITEMS', 500)
+    if len(items) > max_items:
+        return None, (jsonify({"error": f"At most {max_items} {key} per request"}), 400)
+    return items, None
+
+def bulk_response(results):
+    """201 if any item was created (invalid ones carry "errors"), else 400."""
+    created = sum(1 for r in results if "id" in r)
+    body = {"created": created, "failed": len(results) - created, "results": results}
+    return jsonify(body), 201 if created else 400
+
+@api_bp.route('/projects/bulk', methods=['POST'])
+@jwt_required()
+def create_projects_bulk():
+    """
+    Creates many projects for the current user in one transaction.
+    Example input JSON:
+    {"projects": [{"title": "...", "description": "...", "budget": 500,
+                   "required_skills": "python, sql"}, ...]}
+    Results come back in request order as {"index", "id"} or
+    {"index", "errors"}; invalid items do not stop the valid ones.
+    """
+    user = get_user_from_jwt()
+    items, error = bulk_items('projects')
+    if error:
+        return error
+
+    results = ingest_projects(user, items)
+    db.session.commit()
+    if any("id" in r for r in results):
+        response_cache.invalidate(LISTING_TAG, profile_tag(user.id))
+    return bulk_response(results)
+
 @api_bp.route('/project/<int:id>', methods=['GET'])
+@response_cache.cached
 def get_project(id):
+    """
+    The full project (client, freelancer, bids, reviews) unless ?include=
+    and ?fields= narrow it; left-out relations are not loaded.
+    """
+    try:
+        fieldset = parse_fieldset(PROJECT_FIELDS, PROJECT_INCLUDES, default_includes=PROJECT_INCLUDES)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Validators first: an unchanged project costs one aggregate query
+    validators = project_graph_validators([id], extra=(fieldset,))
+    if validators is None:
+        abort(404)
+    cached = not_modified(validators)
+    if cached:
+        return cached
+
+    project = Project.query.options(*project_loader_options(fieldset)).filter_by(id=id).first_or_404()
+    response_cache.tag(*project_graph_tags([project], fieldset.includes))
+    return conditional((fieldset_schema(ProjectSchema, fieldset).dump(project), 200), validators)
+
+@api_bp.route('/project/<int:id>/bids', methods=['GET'])
+@response_cache.cached
+def get_project_bids(id):
+    """
+    The project's bids a page at a time, each with its freelancer.
+    Query params: sort (newest [default], amount, timeline), limit
+    (default 20, max 100), cursor (from X-Next-Cursor, absent on the last page).
+    """
+    if not db.session.query(Project.query.filter_by(id=id).exists()).scalar():
+        abort(404)
+    sort = request.args.get('sort', 'newest')
+    if sort not in BID_SORTS:
+        return jsonify({"error": f"sort must be one of: {', '.join(BID_SORTS)}"}), 400
+    limit = max(1, min(request.args.get('limit', BID_PAGE_SIZE, type=int), MAX_BID_PAGE_SIZE))
+    cursor = request.args.get('cursor')
+    try:
+        after = decode_bid_cursor(sort, cursor) if cursor else None
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+
+    bids, next_key = project_bids_page(id, sort, after, limit)
+    response_cache.tag(project_tag(id), *(user_tag(bid.freelancer_id) for bid in bids))
+    headers = {"X-Next-Cursor": encode_bid_cursor(sort, next_key)} if next_key else {}
+    return jsonify(bids_schema.dump(bids)), 200, headers
+
+@api_bp.route('/project/<int:id>/candidates', methods=['GET'])
+@jwt_required()
+def project_candidates(id):
+    """
+    Freelancers who match the project's required skills, ranked with the
+    bid-independent ranking features, so clients can invite them.
+    Query params: limit (default 20, max 100).
+    """
     project = Project.query.get_or_404(id)
-    return project_schema.dump(project), 200
+    user = get_user_from_jwt()
+
+    if project.client_id != user.id:
+        return jsonify({"msg": "Not authorized"}), 403
+
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    candidates = find_candidates(project, limit)
+
+    # Flag candidates who have already bid on this project
+    bidder_ids = set()
+    if candidates:
+        bidder_ids = set(db.session.execute(
+            db.select(Bid.freelancer_id).where(
+                Bid.project_id == id,
+                Bid.freelancer_id.in_([c.id for c, _, _ in candidates])
+            )
+        ).scalars())
+
+    return jsonify(candidates=[
+        {
+            "freelancer_id": c.id,
+            "freelancer_name": c.username,
+            "skills": c.skills,
+            "avg_rating": c.avg_rating,
+            "score": score,
+            "skill_match": round(features["skill_match"], 4),
+            "has_bid": c.id in bidder_ids,
+        }
+        for c, score, features in candidates
+    ]), 200
 
 @api_bp.route('/project/<int:id>', methods=['PUT'])
 @jwt_required()
@@ -267,11 +645,16 @@ def update_project(id):
     project.title = data.get('title', project.title)
     project.description = data.get('description', project.description)
     project.budget = data.get('budget', project.budget)
-    project.status = data.get('status', project.status)
-    # Add required_skills from new model
-    project.required_skills = data.get('required_skills', project.required_skills)
+    if data.get('status', project.status) != project.status:
+        project.status = data['status']
+        sync_project_open_state(project)
+    # Add required_skills from new model (keeps the skill bitset in sync)
+    if 'required_skills' in data and data['required_skills'] != project.required_skills:
+        set_project_skills(project, data['required_skills'])
+        bump_ranking_version(project.id)
 
     db.session.commit()
+    response_cache.invalidate(project_tag(project.id), LISTING_TAG)
     return project_schema.dump(project), 200
 
 # --- [DELETED THE OLD DUPLICATE 'accept_bid' FUNCTION THAT WAS HERE] ---
@@ -306,9 +689,68 @@ def place_bid(id):
     )
 
     db.session.add(new_bid)
-    db.session.commit()
+    try:
+        # Inserts the bid into the maintained ranking (or marks it for rebuild)
+        record_bid_placed(new_bid)
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request placed the same bid (uq_bid_project_freelancer)
+        db.session.rollback()
+        return jsonify({"msg": "You have already placed a bid on this project"}), 400
+    response_cache.invalidate(project_tag(id))
     return bid_schema.dump(new_bid), 201
 
+@api_bp.route('/bids/bulk', methods=['POST'])
+@jwt_required()
+def place_bids_bulk():
+    """
+    Places many bids in one transaction.
+    Example input JSON:
+    {"bids": [{"project_id": 1, "amount": 300, "proposal": "...",
+               "proposed_timeline_days": 10}, ...]}
+    Every item is a bid of the current freelancer (an item naming another
+    freelancer_id is rejected). Results come back in request order as
+    {"index", "id"} or {"index", "errors"}; invalid items do not stop the
+    valid ones.
+    """
+    user = get_user_from_jwt()
+    if not user.is_freelancer:
+        return jsonify({"msg": "Only freelancers can bid"}), 403
+
+    items, error = bulk_items('bids')
+    if error:
+        return error
+
+    results, project_ids = ingest_bids(user, items)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A bid of the batch was placed concurrently (uq_bid_project_freelancer)
+        db.session.rollback()
+        return jsonify({"msg": "A bid in this batch was placed concurrently; nothing was saved, retry the batch"}), 409
+    response_cache.invalidate(*(project_tag(project_id) for project_id in project_ids))
+    return bulk_response(results)
+
+@api_bp.route('/project/<int:id>/bid', methods=['DELETE'])
+@jwt_required()
+def withdraw_bid(id):
+    """Lets a freelancer withdraw their bid while the project is still open."""
+    user = get_user_from_jwt()
+    project = Project.query.get_or_404(id)
+
+    if project.status != 'open':
+        return jsonify({"msg": "Bids can only be withdrawn while the project is open"}), 400
+
+    bid = Bid.query.filter_by(project_id=id, freelancer_id=user.id).first()
+    if not bid:
+        return jsonify({"msg": "You have no bid on this project"}), 404
+
+    record_bid_withdrawn(bid)
+    db.session.delete(bid)
+    db.session.commit()
+    response_cache.invalidate(project_tag(id))
+    return jsonify({"msg": "Bid withdrawn"}), 200
+
 # --- Review Routes ---
 
 # --- [MODIFIED ROUTE] ---
@@ -324,6 +766,13 @@ def post_review(id):
     user = get_user_from_jwt()
     data = request.get_json()
 
+    try:
+        rating = int(data['rating'])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"msg": "rating must be an integer from 1 to 5"}), 400
+    if rating not in RATING_VALUES:
+        return jsonify({"msg": "rating must be an integer from 1 to 5"}), 400
+
     reviewee_id = None
     
     # --- [CHANGED] Logic for: Client reviews Freelancer ---
@@ -341,7 +790,7 @@ def post_review(id):
 
         # Create the review
         new_review = Review(
-            rating=data['rating'],
+            rating=rating,
             comment=data.get('comment'),
             project_id=id,
             reviewer_id=user.id,
@@ -353,10 +802,16 @@ def post_review(id):
         # The line `project.status = 'completed'` is GONE.
         # Acceptance is handled by the new /accept route.
         
-        db.session.commit() # Commit ONLY the review
-        
-        # Update freelancer's ranking
-        update_user_ranking(reviewee_id)
+        try:
+            # Update freelancer's ranking in the same transaction as the review
+            update_user_ranking(reviewee_id, rating)
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent request posted it first (uq_review_project_reviewer)
+            db.session.rollback()
+            return jsonify({"msg": "You have already reviewed this project"}), 400
+
+        response_cache.invalidate(project_tag(id), user_tag(reviewee_id), profile_tag(reviewee_id))
         return review_schema.dump(new_review), 201
 
     # --- [UNCHANGED] Logic for: Freelancer reviews Client ---
@@ -374,24 +829,115 @@ def post_review(id):
             return jsonify({"msg": "You have already reviewed this project"}), 400
         
         new_review = Review(
-            rating=data['rating'],
+            rating=rating,
             comment=data.get('comment'),
             project_id=id,
             reviewer_id=user.id,
             reviewee_id=reviewee_id
         )
         db.session.add(new_review)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"msg": "You have already reviewed this project"}), 400
         
         # This function also works for clients if you want to track their rating
-        # update_user_ranking(reviewee_id) 
-        
+        # update_user_ranking(reviewee_id, rating) 
+
+        response_cache.invalidate(project_tag(id), user_tag(reviewee_id), profile_tag(reviewee_id))
         return review_schema.dump(new_review), 201
 
     # --- User is not part of the project ---
     else:
         return jsonify({"msg": "You are not part of this project"}), 403
 
+def parse_ranking_options(data):
+    """
+    Reads the paging/payload options shared by the ranking endpoints:
+    limit, offset, debug (default false) and proposal_chars (null keeps
+    the full proposal, 0 omits it, N truncates it).
+    Returns (options, error_message).
+    """
+    try:
+        limit = data.get('limit')
+        limit = None if limit is None else int(limit)
+        offset = int(data.get('offset') or 0)
+        proposal_chars = data.get('proposal_chars')
+        proposal_chars = None if proposal_chars is None else int(proposal_chars)
+    except (TypeError, ValueError):
+        return None, "limit, offset and proposal_chars must be integers"
+
+    if (limit is not None and limit < 1) or offset < 0 or (proposal_chars or 0) < 0:
+        return None, "limit must be positive; offset and proposal_chars must not be negative"
+
+    return {
+        "offset": offset,
+        "limit": limit,
+        "include_debug": bool(data.get('debug', False)),
+        "proposal_chars": proposal_chars,
+    }, None
+
+def render_ranking(page, priority):
+    """
+    Builds the response for one ranking page; returns (response_body,
+    status_code). The project title is added by with_title(), so cached
+    bodies never carry a stale one.
+    """
+    if not page["total_bids"]:
+        return {"ranked_bids": [], "message": "No bids found for this project"}, 200
+
+    return {
+        "priority_used": priority,
+        "weights_applied": adjust_weights_for_priority(priority),
+        "total_bids": page["total_bids"],
+        "ranked_bids": page["ranked_bids"]
+    }, 200
+
+def with_title(response, title):
+    """A rendered ranking with the project's current title."""
+    body, status = response
+    if not body.get("total_bids"):
+        return response
+    return {**body, "project_title": title}, status
+
+def rank_projects(wanted, options):
+    """
+    Ranks several (project_id, priority) pairs and returns
+    {(project_id, priority): (response_body, status_code)}; missing
+    projects are absent.
+
+    Pages are read from the maintained ranking state (app/ranking_state.py)
+    and repeat requests are served from ranking_cache. Cache entries are
+    keyed by the project's ranking_version, so any change to the ranking
+    inputs (new bid, skills, ratings) misses the cache. The title is not
+    a ranking input, so it is left out of cached bodies and added per request.
+    """
+    heads = load_ranking_heads([project_id for project_id, _ in wanted])
+    versions = {project_id: version for project_id, (version, _) in heads.items()}
+    page_key = (options["offset"], options["limit"], options["include_debug"], options["proposal_chars"])
+
+    results = {}
+    misses = []
+    for project_id, priority in wanted:
+        if project_id not in versions:
+            continue
+        cached = ranking_cache.get((project_id, priority, versions[project_id], page_key))
+        if cached is None:
+            misses.append((project_id, priority))
+        else:
+            results[(project_id, priority)] = with_title(cached, heads[project_id][1])
+
+    if misses:
+        # --- Data Fetching (shared across every cache miss) ---
+        pages = read_rankings(misses, options)
+        for (project_id, priority), page in pages.items():
+            response = render_ranking(page, priority)
+            ranking_cache.set((project_id, priority, versions[project_id], page_key), response)
+            results[(project_id, priority)] = with_title(response, heads[project_id][1])
+
+    return results
+
 @api_bp.route('/rank_bids', methods=['POST'])
 def rank_bids():
     """
@@ -399,7 +945,11 @@ def rank_bids():
     Example input JSON:
     {
         "project_id": 1,
-        "priority": "price"  # or "time", "ratings", "balanced"
+        "priority": "price",  # or "time", "ratings", "balanced"
+        "limit": 10,          # optional: return only the top `limit` bids
+        "offset": 0,          # optional: skip the first `offset` ranks
+        "debug": false,       # optional: include per-bid feature dicts
+        "proposal_chars": 200 # optional: truncate proposals (0 omits them)
     }
     """
     data = request.get_json()
@@ -408,28 +958,142 @@ def rank_bids():
 
     if not project_id:
         return jsonify({"error": "project_id is required"}), 400
+    try:
+        project_id = int(project_id)
+    except (TypeError, ValueError):
+        return jsonify({"error": "project_id must be an integer"}), 400
 
-    # --- Data Fetching ---
-    project = Project.query.get(project_id)
-    if not project:
+    options, error = parse_ranking_options(data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    ranked = rank_projects([(project_id, priority)], options)
+    if (project_id, priority) not in ranked:
         return jsonify({"error": "Project not found"}), 404
 
-    bids = Bid.query.filter_by(project_id=project_id).all()
-    if not bids:
-        return jsonify({"ranked_bids": [], "message": "No bids found for this project"}), 200
+    body, status = ranked[(project_id, priority)]
+    return jsonify(body), status
+
+@api_bp.route('/rank_bids/batch', methods=['POST'])
+def rank_bids_batch():
+    """
+    Ranks bids for many projects in one request.
+    Example input JSON:
+    {
+        "projects": [
+            {"project_id": 1, "priority": "price"},
+            {"project_id": 2}
+        ],
+        "limit": 5  # optional; same paging options as /rank_bids
+    }
+    All projects, bids and bidders are loaded with shared queries, so the
+    cost grows with the total number of bids, not the number of projects.
+    Results are returned in request order; a missing project gets an
+    "error" entry instead of failing the whole batch.
+    """
+    data = request.get_json() or {}
+    items = data.get('projects')
+
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "projects must be a non-empty list"}), 400
+
+    max_projects = current_app.config.get('RANK_BATCH_MAX_PROJECTS', 100)
+    if len(items) > max_projects:
+        return jsonify({"error": f"At most {max_projects} projects can be ranked per batch"}), 400
+
+    options, error = parse_ranking_options(data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    wanted, error = parse_ranking_targets(items)
+    if error:
+        return jsonify({"error": error}), 400
+
+    return jsonify({"results": batch_results(wanted, options)}), 200
+
+def parse_ranking_targets(items):
+    """Turns a list of {"project_id", "priority"} into (wanted, error_message)."""
+    wanted = []
+    for item in items:
+        try:
+            project_id = int(item['project_id'])
+        except (TypeError, KeyError, ValueError):
+            return None, "Each entry needs an integer project_id"
+        wanted.append((project_id, (item.get('priority') or 'balanced').lower()))
+    return wanted, None
+
+def batch_results(wanted, options):
+    """Ranks `wanted` and lists the results in request order."""
+    ranked = rank_projects(wanted, options)
+
+    results = []
+    for project_id, priority in wanted:
+        if (project_id, priority) not in ranked:
+            results.append({"project_id": project_id, "error": "Project not found"})
+            continue
+
+        body, _ = ranked[(project_id, priority)]
+        results.append({"project_id": project_id, **body})
+    return results
+
+@api_bp.route('/rank_bids/jobs', methods=['POST'])
+def submit_ranking_job():
+    """
+    Queues a ranking to run in the background, for projects with too many
+    bids to rank within a request. Takes the body of /rank_bids (one
+    "project_id") or of /rank_bids/batch (a "projects" list) and returns
+    a job id to poll at GET /api/rank_bids/jobs/<job_id>.
+    """
+    data = request.get_json() or {}
+    items = data.get('projects')
+    if items is None:
+        items = [data] if data.get('project_id') else []
+
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "project_id or a non-empty projects list is required"}), 400
+
+    max_projects = current_app.config.get('RANK_BATCH_MAX_PROJECTS', 100)
+    if len(items) > max_projects:
+        return jsonify({"error": f"At most {max_projects} projects can be ranked per batch"}), 400
 
-    # --- Call the Logic Function ---
-    ranking_data = calculate_ranked_bids(project, bids, priority)
+    options, error = parse_ranking_options(data)
+    if error:
+        return jsonify({"error": error}), 400
 
-    if "error" in ranking_data:
-        return jsonify(ranking_data), 404
+    wanted, error = parse_ranking_targets(items)
+    if error:
+        return jsonify({"error": error}), 400
 
+    job_id = ranking_jobs.submit(batch_results, wanted, options)
     return jsonify({
-        "project_title": project.title,
-        "priority_used": priority,
-        "weights_applied": ranking_data.get("weights_applied"),
-        "ranked_bids": ranking_data.get("ranked_bids")
-    }), 200
+        "job_id": job_id,
+        "status": "pending",
+        "status_url": f"/api/rank_bids/jobs/{job_id}"
+    }), 202
+
+@api_bp.route('/rank_bids/jobs/<job_id>', methods=['GET'])
+def get_ranking_job(job_id):
+    """
+    Status of a ranking job: pending, running, done (with "results", as
+    returned by /rank_bids/batch) or failed (with "error").
+    """
+    job = ranking_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+
+    if "result" in job:
+        job["results"] = job.pop("result")
+    return jsonify(job), 200
+
+@api_bp.route('/rank_bids/cache_stats', methods=['GET'])
+def rank_bids_cache_stats():
+    """Hit/miss counters of the ranking result cache."""
+    return jsonify(ranking_cache.stats()), 200
+
+@api_bp.route('/response_cache/stats', methods=['GET'])
+def response_cache_stats():
+    """Hit/miss/invalidation counters of the public response cache."""
+    return jsonify(response_cache.stats()), 200
 
 @api_bp.route('/user/my-accepted-projects', methods=['GET'])
 @jwt_required()
@@ -474,6 +1138,7 @@ def freelancer_complete_project(id):
     # 3. Update status
     project.status = 'pending_review'
     db.session.commit()
+    response_cache.invalidate(project_tag(project.id))
     return project_schema.dump(project), 200
 
 
@@ -499,6 +1164,7 @@ def client_request_revision(id):
     # 3. Update status
     project.status = 'needs_revision'
     db.session.commit()
+    response_cache.invalidate(project_tag(project.id))
     return project_schema.dump(project), 200
 
 # --- [DELETED THE OLD DUPLICATE 'client_accept_work' FUNCTION THAT WAS HERE] ---
@@ -535,9 +1201,15 @@ def accept_bid(id):
     project.freelancer_id = bid.freelancer_id
     project.status = 'in_progress'
     project.accepted_bid_id = bid.id
+    # The project leaves the open-project skill index
+    sync_project_open_state(project)
 
     # This commit saves both the project changes AND the freelancer's updated count
     db.session.commit() 
+    response_cache.invalidate(
+        project_tag(project.id), LISTING_TAG,
+        user_tag(bid.freelancer_id), profile_tag(bid.freelancer_id)
+    )
     return project_schema.dump(project), 200
 
 
@@ -571,4 +1243,5 @@ def client_accept_work(id):
     
     # This commit saves both the project status AND the freelancer's updated count
     db.session.commit()
+    response_cache.invalidate(project_tag(project.id), user_tag(project.freelancer_id))
     return project_schema.dump(project), 200
\ No newline at end of file
@@ -49,6 +49,18 @@ class ProjectSchema(ma.SQLAlchemyAutoSchema):
             "required_skills", "client", "freelancer", "bids", "reviews", "accepted_bid_id"
         )
 
+class ProjectCardSchema(ma.SQLAlchemyAutoSchema):
+    """Lean project shape for list views (no bids or reviews)."""
+    client = fields.Nested(UserPublicSchema)
+
+    class Meta:
+        model = Project
+        include_fk = True
+        fields = (
+            "id", "title", "description", "budget", "status", "created_at",
+            "required_skills", "client"
+        )
+
 class UserSchema(ma.SQLAlchemyAutoSchema):
     # Include reviews received (nested)
     reviews_received = fields.Nested(ReviewSchema, many=True)
@@ -56,8 +68,13 @@ class UserSchema(ma.SQLAlchemyAutoSchema):
     class Meta:
         model = User
         load_instance = True
-        # Do not expose password_hash
-        exclude = ("password_hash",)
+        # Expose fields explicitly, so internal columns (password_hash, the
+        # skill index) never leak into the output
+        fields = (
+            "id", "username", "email", "is_freelancer", "bio", "skills",
+            "avg_rating", "completion_rate", "on_time_rate", "portfolio_score",
+            "projects_accepted", "projects_completed", "reviews_received", "password"
+        )
 
     # Accept plaintext password on input (load-only)
     password = fields.String(load_only=True)
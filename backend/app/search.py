@@ -0,0 +1,137 @@
+# Full-text project search.
+# On SQLite with FTS5, `project_fts` is an external-content FTS5 index over
+# project.title, description and required_skills. Triggers on `project`
+# keep it in sync inside the same transaction as every insert, update
+# and delete. The status filter is applied by joining back to `project`,
+# so status changes need no index maintenance. Results are ordered by
+# bm25 relevance. Without FTS5 (another database, or SQLite built without
+# it) search falls back to LIKE matching, newest first.
+
+import re
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import selectinload
+
+from app import db
+from app.models import Project
+
+FTS_TABLE = "project_fts"
+
+# bm25 column weights: title, description, required_skills
+BM25_WEIGHTS = (10.0, 1.0, 5.0)
+
+_CREATE_FTS = f"""
+CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+    title, description, required_skills,
+    content='project', content_rowid='id', tokenize='porter unicode61'
+)
+"""
+
+_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON project BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, required_skills)
+        VALUES (new.id, new.title, new.description, new.required_skills);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON project BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, required_skills)
+        VALUES ('delete', old.id, old.title, old.description, old.required_skills);
+    END
+    """,
+    # Only the indexed columns: ranking_version bumps etc. skip the index
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF title, description, required_skills ON project BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, required_skills)
+        VALUES ('delete', old.id, old.title, old.description, old.required_skills);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, required_skills)
+        VALUES (new.id, new.title, new.description, new.required_skills);
+    END
+    """,
+]
+
+# Databases (by URL) known to have the FTS index
+_fts_available = {}
+
+
+def install_search_index(connection):
+    """
+    Creates the FTS5 table and its triggers if they are missing and indexes
+    the existing projects. Returns True if it created the index; does
+    nothing on databases without FTS5.
+    """
+    if connection.dialect.name != "sqlite" or inspect(connection).has_table(FTS_TABLE):
+        return False
+    try:
+        connection.execute(text(_CREATE_FTS))
+    except OperationalError:
+        return False  # SQLite built without FTS5
+
+    for trigger in _TRIGGERS:
+        connection.execute(text(trigger))
+    connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    return True
+
+
+def fts_available():
+    engine = db.engine
+    key = str(engine.url)
+    if key not in _fts_available:
+        _fts_available[key] = (
+            engine.dialect.name == "sqlite" and inspect(engine).has_table(FTS_TABLE)
+        )
+    return _fts_available[key]
+
+
+def search_terms(q):
+    """Splits user input into plain words (FTS operators are not exposed)."""
+    return re.findall(r"\w+", q or "")
+
+
+def search_projects(q, offset=0, limit=20):
+    """
+    Returns [(project, score)] for the open projects matching every word
+    of `q`, most relevant first. `score` is the bm25 relevance (higher is
+    better), or None when searching without FTS5.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return []
+
+    if fts_available():
+        # Quoted terms are matched literally (after stemming). No prefix
+        # queries: a short prefix expands to thousands of terms.
+        match = " ".join(f'"{t}"' for t in terms)
+        fts = db.table(FTS_TABLE, db.column("rowid"))
+        fts_ref = db.literal_column(FTS_TABLE)
+        score = db.func.bm25(fts_ref, *BM25_WEIGHTS).label("score")
+        rows = db.session.execute(
+            db.select(Project, score)
+            .join(fts, fts.c.rowid == Project.id)
+            .where(fts_ref.op("MATCH")(match), Project.status == 'open')
+            .options(selectinload(Project.client))
+            .order_by(score, Project.id)
+            .offset(offset)
+            .limit(limit)
+        ).all()
+        # bm25 is negative, lower meaning more relevant
+        return [(project, round(-score, 4)) for project, score in rows]
+
+    query = db.select(Project).where(Project.status == 'open')
+    for term in terms:
+        pattern = f"%{term}%"
+        query = query.where(db.or_(
+            Project.title.ilike(pattern),
+            Project.description.ilike(pattern),
+            Project.required_skills.ilike(pattern),
+        ))
+    projects = db.session.execute(
+        query.options(selectinload(Project.client))
+        .order_by(Project.created_at.desc(), Project.id.desc())
+        .offset(offset)
+        .limit(limit)
+    ).scalars().all()
+    return [(project, None) for project in projects]
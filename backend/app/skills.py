@@ -0,0 +1,292 @@
+# Skill vocabulary helpers.
+# Every canonical skill name (stripped, lower-cased) is interned in the
+# `skill` table; its id is used as a bit position. Users and projects keep
+# their CSV skill text for the API and a precomputed bitset for ranking.
+#
+# For SKILL_MATCH_MODE = "idf" they also keep a sparse, L2-normalized
+# vector of IDF weights, so a rare skill counts for more than a common one
+# and the match is a cosine (sparse dot product); other modes do not
+# compute vectors at all. Skill.doc_freq and the population size
+# (skill_corpus) are kept up to date incrementally as freelancer profiles
+# change; stored vectors use the weights of the time they were written and
+# are refreshed to the current ones by `flask reindex-skills`.
+
+import json
+import math
+
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import User, Project, ProjectSkill, Skill, SkillCorpus, UserSkill
+
+
+def parse_skills(skills_csv):
+    """Splits a comma-separated skill string into unique canonical names."""
+    if not skills_csv:
+        return []
+    names = []
+    for raw in skills_csv.split(','):
+        name = raw.strip().lower()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def intern_skills(names):
+    """Returns {name: skill_id}, creating vocabulary entries as needed."""
+    if not names:
+        return {}
+
+    ids = dict(db.session.execute(
+        db.select(Skill.name, Skill.id).where(Skill.name.in_(names))
+    ).all())
+
+    for name in names:
+        if name in ids:
+            continue
+        skill = Skill(name=name)
+        try:
+            with db.session.begin_nested():
+                db.session.add(skill)
+            ids[name] = skill.id
+        except IntegrityError:
+            # Another request interned the same name first
+            ids[name] = db.session.execute(
+                db.select(Skill.id).where(Skill.name == name)
+            ).scalar_one()
+    return ids
+
+
+def skill_ids_to_bits(skill_ids):
+    """Packs skill ids into a little-endian bitset."""
+    mask = 0
+    for skill_id in skill_ids:
+        mask |= 1 << skill_id
+    return mask.to_bytes((mask.bit_length() + 7) // 8, 'little')
+
+
+def skill_ids_from_mask(mask):
+    """Unpacks a skill bitset into the list of skill ids it contains."""
+    ids = []
+    while mask:
+        low = mask & -mask
+        ids.append(low.bit_length() - 1)
+        mask ^= low
+    return ids
+
+
+def skills_to_bits(skills_csv):
+    """Interns the skills in a CSV string and returns their bitset."""
+    return skill_ids_to_bits(intern_skills(parse_skills(skills_csv)).values())
+
+
+def jaccard_mask_match(project_mask, freelancer_mask):
+    """Jaccard similarity of two skill bitsets, via popcount."""
+    if not project_mask:
+        return 0.5  # If no skills required, it's a neutral match
+    union = (project_mask | freelancer_mask).bit_count()
+    return (project_mask & freelancer_mask).bit_count() / union
+
+
+def idf_mask_match(project_weights, freelancer_weights):
+    """Cosine similarity of two normalized sparse skill vectors."""
+    if not project_weights:
+        return 0.5  # If no skills required, it's a neutral match
+    if len(freelancer_weights) < len(project_weights):
+        project_weights, freelancer_weights = freelancer_weights, project_weights
+    return sum(
+        weight * freelancer_weights.get(skill_id, 0.0)
+        for skill_id, weight in project_weights.items()
+    )
+
+
+def vectors_enabled():
+    """Skill vectors are only used, and so only computed, in SKILL_MATCH_MODE = "idf"."""
+    return current_app.config.get("SKILL_MATCH_MODE", "jaccard") == "idf"
+
+
+def _count_indexed_freelancers():
+    return db.session.execute(
+        db.select(db.func.count()).select_from(User)
+        .where(User.is_freelancer.is_(True), User.skill_count > 0)
+    ).scalar()
+
+
+def corpus_size():
+    """
+    The IDF population size N from the running skill_corpus counter,
+    counted from the users table only when the row does not exist yet.
+    """
+    n = db.session.execute(
+        db.select(SkillCorpus.freelancer_count).where(SkillCorpus.id == 1)
+    ).scalar()
+    if n is not None:
+        return n
+    n = _count_indexed_freelancers()
+    try:
+        with db.session.begin_nested():
+            db.session.add(SkillCorpus(id=1, freelancer_count=n))
+    except IntegrityError:
+        # Another request created the row first
+        pass
+    return n
+
+
+def skill_idf(skill_ids):
+    """
+    Smoothed inverse document frequency of each skill over the freelancer
+    population: ln((1 + N) / (1 + df)) + 1.
+    """
+    if not skill_ids:
+        return {}
+    n = corpus_size()
+    return {
+        skill_id: math.log((1 + n) / (1 + doc_freq)) + 1
+        for skill_id, doc_freq in db.session.execute(
+            db.select(Skill.id, Skill.doc_freq).where(Skill.id.in_(skill_ids))
+        )
+    }
+
+
+def skill_vector(skill_ids, idf=None):
+    """
+    JSON text of the L2-normalized IDF vector of a skill set. `idf` may be
+    a precomputed skill_idf() covering the set (e.g. for a batch).
+    """
+    weights = skill_idf(skill_ids) if idf is None else {s: idf[s] for s in skill_ids if s in idf}
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    return json.dumps({
+        str(skill_id): round(w / norm, 6) for skill_id, w in sorted(weights.items())
+    })
+
+
+def _adjust_doc_freq(skill_ids, delta):
+    if skill_ids:
+        db.session.execute(
+            db.update(Skill)
+            .where(Skill.id.in_(skill_ids))
+            .values(doc_freq=Skill.doc_freq + delta)
+        )
+
+
+def _adjust_corpus_size(delta):
+    # A missing row is created from a count on first read (corpus_size)
+    if delta:
+        db.session.execute(
+            db.update(SkillCorpus)
+            .where(SkillCorpus.id == 1)
+            .values(freelancer_count=SkillCorpus.freelancer_count + delta)
+        )
+
+
+def set_user_skills(user, skills_csv):
+    """
+    Updates a user's skill text and keeps its bitset, its skill vector and,
+    for freelancers, its inverted-index entries (user_skill) and the skills'
+    document frequencies in sync.
+    """
+    skill_ids = set(intern_skills(parse_skills(skills_csv)).values())
+    was_counted = user.is_freelancer and (user.skill_count or 0) > 0
+    user.skills = skills_csv
+    user.skill_bits = skill_ids_to_bits(skill_ids)
+    user.skill_count = len(skill_ids)
+
+    indexed = skill_ids if user.is_freelancer else set()
+    kept = [link for link in user.skill_links if link.skill_id in indexed]
+    linked = {link.skill_id for link in kept}
+    removed = {link.skill_id for link in user.skill_links} - indexed
+    user.skill_links = kept + [
+        UserSkill(skill_id=skill_id) for skill_id in indexed - linked
+    ]
+
+    # The user_skill posting lists are the document frequencies
+    _adjust_doc_freq(indexed - linked, 1)
+    _adjust_doc_freq(removed, -1)
+    _adjust_corpus_size(int(bool(indexed)) - int(was_counted))
+    user.skill_vector = skill_vector(skill_ids) if vectors_enabled() else None
+
+
+def set_project_skills(project, skills_csv):
+    """
+    Updates a project's required skills and keeps its bitset and its
+    inverted-index entries (project_skill) in sync.
+    """
+    skill_ids = set(intern_skills(parse_skills(skills_csv)).values())
+    project.required_skills = skills_csv
+    project.skill_bits = skill_ids_to_bits(skill_ids)
+    project.skill_count = len(skill_ids)
+    project.skill_vector = skill_vector(skill_ids) if vectors_enabled() else None
+
+    is_open = (project.status or 'open') == 'open'
+    kept = [link for link in project.skill_links if link.skill_id in skill_ids]
+    linked = {link.skill_id for link in kept}
+    project.skill_links = kept + [
+        ProjectSkill(skill_id=skill_id, is_open=is_open)
+        for skill_id in skill_ids - linked
+    ]
+
+
+def open_projects_with_skills(names, match_all=False):
+    """
+    Select of the ids of open projects requiring any (or, with match_all,
+    every) of the given canonical skill names, answered from the
+    project_skill index. Returns None when no project can match.
+    """
+    skill_ids = list(dict(db.session.execute(
+        db.select(Skill.name, Skill.id).where(Skill.name.in_(names))
+    ).all()).values()) if names else []
+    if not skill_ids or (match_all and len(skill_ids) < len(names)):
+        return None
+
+    query = (
+        db.select(ProjectSkill.project_id)
+        .where(ProjectSkill.skill_id.in_(skill_ids), ProjectSkill.is_open.is_(True))
+    )
+    if match_all:
+        query = query.group_by(ProjectSkill.project_id).having(db.func.count() == len(skill_ids))
+    return query
+
+
+def sync_project_open_state(project):
+    """
+    Mirrors the project's status into its index entries, so the project
+    enters/leaves the open-project posting lists. Call after a status change.
+    """
+    is_open = project.status == 'open'
+    for link in project.skill_links:
+        link.is_open = is_open
+
+
+def reindex_all_skills():
+    """
+    Recomputes the bitsets of every user and project, both inverted skill
+    indexes, the document frequencies and every skill vector against the
+    current IDF weights (backfill/repair). Run it after changing
+    SKILL_MATCH_MODE too: every project's ranking is invalidated.
+    """
+    users = User.query.all()
+    for user in users:
+        set_user_skills(user, user.skills)
+    projects = Project.query.all()
+    for project in projects:
+        set_project_skills(project, project.required_skills)
+        sync_project_open_state(project)
+
+    # Repair the document frequencies from the posting lists, and the
+    # population size from the users ...
+    doc_freq = (
+        db.select(db.func.count())
+        .where(UserSkill.skill_id == Skill.id)
+        .scalar_subquery()
+    )
+    db.session.execute(db.update(Skill).values(doc_freq=doc_freq))
+    db.session.merge(SkillCorpus(id=1, freelancer_count=_count_indexed_freelancers()))
+
+    # ... and rewrite the vectors written with older weights
+    if vectors_enabled():
+        for row in users + projects:
+            row.skill_vector = skill_vector(skill_ids_from_mask(row.skill_mask or 0))
+
+    db.session.execute(db.update(Project).values(ranking_version=Project.ranking_version + 1))
+    db.session.commit()
@@ -0,0 +1,242 @@
+"""
+Micro-benchmarks for the bid-ranking pipeline.
+
+Generates reproducible synthetic projects, freelancers and bids (no
+database involved) and times each ranking stage separately for every
+requested scoring engine on identical inputs. Results are written as JSON
+so runs can be compared.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_ranking
+    python -m benchmarks.bench_ranking --sizes 10 1000 100000 --engines python numpy \
+        --vocab 2000 --skills-per-user 8 --output bench_results.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import time
+from datetime import datetime
+
+from app import create_app
+from app.ranking_data import BidRow, FreelancerRow, ProjectRow
+from app.ranking_logic import (
+    FEATURE_KEYS,
+    INVERTED_FEATURES,
+    calculate_ranked_bids,
+    collect_bid_features,
+    jaccard_skill_match,
+    normalize_feature_list,
+    score_features,
+)
+from app.skills import idf_mask_match, jaccard_mask_match, parse_skills
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+
+# --- Synthetic data ---
+
+def generate_dataset(n_bids, vocab_size=500, skills_per_user=5, project_skills=6, seed=42):
+    """
+    Builds one project and `n_bids` bids from distinct freelancers, as the
+    same plain rows ranking_data.load_ranking_snapshot() returns.
+    Skill ids are 1..vocab_size and the masks match the CSV text; the IDF
+    vectors use the document frequencies of the generated freelancers.
+    """
+    rnd = random.Random(seed)
+    vocab = [f"skill{i}" for i in range(1, vocab_size + 1)]
+
+    def pick_skills(k):
+        ids = rnd.sample(range(1, vocab_size + 1), min(k, vocab_size))
+        mask = 0
+        for skill_id in ids:
+            mask |= 1 << skill_id
+        return ids, ", ".join(vocab[i - 1] for i in ids), mask
+
+    project_ids, skills, mask = pick_skills(project_skills)
+    project = (1, "Benchmark project", skills, mask)
+
+    freelancers = []
+    bids = []
+    doc_freq = [0] * (vocab_size + 1)
+    for i in range(1, n_bids + 1):
+        ids, skills, mask = pick_skills(rnd.randint(1, skills_per_user * 2 - 1))
+        for skill_id in ids:
+            doc_freq[skill_id] += 1
+        freelancers.append((ids, (
+            i, f"freelancer{i}",
+            round(rnd.uniform(0, 5), 2), rnd.random(), rnd.random(), rnd.random(),
+            skills, mask
+        )))
+        bids.append(BidRow(
+            i, float(rnd.randint(50, 5000)), "Proposal text " * rnd.randint(1, 20),
+            rnd.choice([None, 3, 7, 14, 30, 60]), i, project[0]
+        ))
+
+    # Same weighting as skills.skill_vector()
+    def vector(ids):
+        weights = {s: math.log((1 + n_bids) / (1 + doc_freq[s])) + 1 for s in ids}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        return {s: w / norm for s, w in weights.items()}
+
+    freelancers = {
+        fields[0]: FreelancerRow(*fields, vector(ids)) for ids, fields in freelancers
+    }
+    return ProjectRow(*project, vector(project_ids)), bids, freelancers
+
+
+# --- Stages ---
+
+def stage_jaccard_csv(project, bids, freelancers, engine):
+    project_skills = parse_skills(project.required_skills)
+    for bid in bids:
+        jaccard_skill_match(project_skills, parse_skills(freelancers[bid.freelancer_id].skills))
+
+
+def stage_jaccard_mask(project, bids, freelancers, engine):
+    for bid in bids:
+        jaccard_mask_match(project.skill_mask, freelancers[bid.freelancer_id].skill_mask)
+
+
+def stage_skill_idf(project, bids, freelancers, engine):
+    for bid in bids:
+        idf_mask_match(project.skill_weights, freelancers[bid.freelancer_id].skill_weights)
+
+
+def stage_features(project, bids, freelancers, engine):
+    return collect_bid_features(project, bids, freelancers)
+
+
+def stage_features_pool(project, bids, freelancers, engine):
+    from app.ranking_pool import collect_bid_features_parallel
+    return collect_bid_features_parallel(project, bids, freelancers)
+
+
+def stage_normalize(per_bid_data, engine):
+    if engine == "numpy":
+        from app.ranking_vectorized import build_feature_matrix, normalize_feature_matrix
+        return normalize_feature_matrix(build_feature_matrix(per_bid_data))
+    return [
+        normalize_feature_list([b["features"][k] for b in per_bid_data], invert=k in INVERTED_FEATURES)
+        for k in FEATURE_KEYS
+    ]
+
+
+def stage_score(per_bid_data, engine):
+    return score_features(per_bid_data, "balanced")
+
+
+def stage_top10(scored, engine):
+    return scored.page(limit=10, include_debug=False)
+
+
+def stage_full_sort(scored, engine):
+    return scored.page(include_debug=False)
+
+
+def stage_end_to_end(project, bids, freelancers, engine):
+    return calculate_ranked_bids(project, bids, "balanced", freelancers, include_debug=False)
+
+
+def time_call(fn, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def run(args):
+    app = create_app()
+    # Time the in-process path for every size; features_pool covers the pool
+    app.config["RANKING_POOL_THRESHOLD"] = 0
+    results = []
+
+    for n_bids in args.sizes:
+        dataset = generate_dataset(
+            n_bids, args.vocab, args.skills_per_user, args.project_skills, args.seed
+        )
+        reference_scores = None
+
+        for engine in args.engines:
+            app.config["RANKING_ENGINE"] = engine
+            with app.app_context():
+                per_bid_data = stage_features(*dataset, engine)
+                scored = stage_score(per_bid_data, engine)
+
+                stages = [
+                    ("jaccard_csv", lambda: stage_jaccard_csv(*dataset, engine)),
+                    ("jaccard_mask", lambda: stage_jaccard_mask(*dataset, engine)),
+                    ("skill_idf", lambda: stage_skill_idf(*dataset, engine)),
+                    ("features", lambda: stage_features(*dataset, engine)),
+                    ("features_pool", lambda: stage_features_pool(*dataset, engine)),
+                    ("normalize", lambda: stage_normalize(per_bid_data, engine)),
+                    ("score", lambda: stage_score(per_bid_data, engine)),
+                    ("top10", lambda: stage_top10(scored, engine)),
+                    ("full_sort", lambda: stage_full_sort(scored, engine)),
+                    ("end_to_end", lambda: stage_end_to_end(*dataset, engine)),
+                ]
+                for stage, fn in stages:
+                    if args.stages and stage not in args.stages:
+                        continue
+                    timings, _ = time_call(fn, args.repeat)
+                    results.append({
+                        "engine": engine,
+                        "n_bids": n_bids,
+                        "stage": stage,
+                        "repeat": args.repeat,
+                        "best_s": min(timings),
+                        "mean_s": statistics.mean(timings),
+                    })
+                    print(f"{engine:>6} {n_bids:>7} {stage:<13} best {min(timings) * 1000:10.3f} ms")
+
+                # Engines must agree on identical inputs
+                scores = [b["score"] for b in scored.page(include_debug=False)]
+                if reference_scores is None:
+                    reference_scores = scores
+                elif scores != reference_scores:
+                    print(f"WARNING: {engine} scores differ from {args.engines[0]} at n_bids={n_bids}")
+
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bid-ranking stages.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="bid counts to benchmark")
+    parser.add_argument("--engines", nargs="+", default=["python", "numpy"],
+                        choices=["python", "numpy"], help="scoring engines to compare")
+    parser.add_argument("--stages", nargs="*", default=None,
+                        help="only run these stages (default: all)")
+    parser.add_argument("--vocab", type=int, default=500, help="skill vocabulary size")
+    parser.add_argument("--skills-per-user", type=int, default=5,
+                        help="average number of skills per freelancer")
+    parser.add_argument("--project-skills", type=int, default=6,
+                        help="number of skills the project requires")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the generator")
+    parser.add_argument("--output", default="bench_results.json",
+                        help="where to write the JSON results")
+    args = parser.parse_args()
+
+    report = run(args)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
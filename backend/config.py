@@ -13,4 +13,54 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or "dev_secret_key_1234567890!@#$"
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or "dev_jwt_secret_key_0987654321!@#$"
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///site.db'
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Bid ranking engine: "python" (default) or "numpy" (vectorized)
+    RANKING_ENGINE = os.environ.get('RANKING_ENGINE') or 'python'
+
+    # Skill match feature: "jaccard" (default) or "idf" (rare skills weigh
+    # more). Run `flask reindex-skills` after changing it.
+    SKILL_MATCH_MODE = os.environ.get('SKILL_MATCH_MODE') or 'jaccard'
+
+    # Maximum number of projects accepted by POST /api/rank_bids/batch
+    RANK_BATCH_MAX_PROJECTS = int(os.environ.get('RANK_BATCH_MAX_PROJECTS') or 100)
+
+    # Maximum number of items accepted by POST /api/projects/bulk and /api/bids/bulk
+    BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS') or 500)
+
+    # Ranking results (and async ranking job status) are cached in this
+    # process ("memory", RANKING_CACHE_SIZE entries) or in the disk cache
+    # shared by every worker ("disk")
+    RANKING_CACHE_BACKEND = os.environ.get('RANKING_CACHE_BACKEND') or 'memory'
+    RANKING_CACHE_SIZE = int(os.environ.get('RANKING_CACHE_SIZE') or 1024)
+
+    # Bid count from which feature extraction runs in a process pool
+    # (0, the default, disables the pool; it only pays off on multi-core
+    # hosts), the pool size (default: CPU count) and the number of bids
+    # handed to a worker at a time
+    RANKING_POOL_THRESHOLD = int(os.environ.get('RANKING_POOL_THRESHOLD') or 0)
+    RANKING_POOL_WORKERS = int(os.environ.get('RANKING_POOL_WORKERS') or 0) or None
+    RANKING_POOL_CHUNK_SIZE = int(os.environ.get('RANKING_POOL_CHUNK_SIZE') or 5000)
+
+    # Background threads running async ranking jobs, and how many finished
+    # jobs are kept for polling
+    RANKING_JOB_WORKERS = int(os.environ.get('RANKING_JOB_WORKERS') or 2)
+    RANKING_JOB_HISTORY = int(os.environ.get('RANKING_JOB_HISTORY') or 256)
+
+    # Cache of rendered public GET responses (/projects, /project/<id>,
+    # /user/<id>): backend ("memory", "disk" or a dotted class path), entry count
+    # and time to live in seconds (0 disables it)
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND') or 'memory'
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE') or 512)
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL') or 30)
+
+    # Cross-process cache file (app/disk_cache.py) used by the "disk"
+    # backends; default instance/cache.sqlite3, evicted by size
+    DISK_CACHE_PATH = os.environ.get('DISK_CACHE_PATH') or None
+    DISK_CACHE_MAX_BYTES = int(os.environ.get('DISK_CACHE_MAX_BYTES') or 256 * 1024 * 1024)
+
+    # Freelancer.com rating lookups: "memory" or "disk", entry count and
+    # time to live in seconds
+    EXTERNAL_CACHE_BACKEND = os.environ.get('EXTERNAL_CACHE_BACKEND') or 'memory'
+    EXTERNAL_CACHE_SIZE = int(os.environ.get('EXTERNAL_CACHE_SIZE') or 1024)
+    EXTERNAL_CACHE_TTL = int(os.environ.get('EXTERNAL_CACHE_TTL') or 24 * 3600)
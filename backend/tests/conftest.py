@@ -0,0 +1,128 @@
+# Shared fixtures for the regression tests: apps over fresh in-memory
+# SQLite databases seeded with a small marketplace of a chosen size, and a
+# recorder of the SQL statements they execute.
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import create_app, db
+from config import Config
+
+PASSWORD = "pw"
+
+Account = namedtuple("Account", ["id", "email"])
+# projects are ids, newest first; every project but the last has bids and a
+# review; busy_project (the oldest) has a bid from every freelancer
+Marketplace = namedtuple("Marketplace", ["client", "freelancers", "projects", "busy_project"])
+
+FREELANCER_SKILLS = ("python, sql", "react, javascript", "python, react")
+PROJECT_SKILLS = ("python, sql", "react", "python")
+
+
+class TestConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    TESTING = True
+    # Every request must run its queries
+    RESPONSE_CACHE_TTL = 0
+
+
+def seed_marketplace(size):
+    """
+    One client, `size` freelancers and `size` open projects of that client,
+    plus a busy project. Returns a Marketplace of ids and emails.
+    """
+    from app.models import User, Project, Bid, Review
+    from app.skills import set_project_skills, set_user_skills
+
+    client = User(username="client", email="client@example.com", is_freelancer=False)
+    client.set_password(PASSWORD)
+    db.session.add(client)
+    freelancers = []
+    for i in range(size):
+        # Hashing is slow: every freelancer shares the client's password
+        user = User(username=f"freelancer{i}", email=f"freelancer{i}@example.com",
+                    is_freelancer=True, password_hash=client.password_hash)
+        db.session.add(user)
+        db.session.flush()
+        set_user_skills(user, FREELANCER_SKILLS[i % 3])
+        freelancers.append(user)
+
+    now = datetime.utcnow()
+    projects = []
+    for i in range(size):
+        project = Project(title=f"Project {i}", description="Build an API",
+                          budget=100 * (i % 3 + 1), client_id=client.id,
+                          created_at=now - timedelta(minutes=i))
+        set_project_skills(project, PROJECT_SKILLS[i % 3])
+        projects.append(project)
+    busy = Project(title="Busy project", description="Many bids", budget=1000,
+                   client_id=client.id, created_at=now - timedelta(days=1))
+    set_project_skills(busy, "python")
+    db.session.add_all([*projects, busy])
+    db.session.flush()
+
+    for i, project in enumerate(projects[:-1]):
+        for j in range(2):
+            db.session.add(Bid(amount=50 + j, proposal="I can do it", project_id=project.id,
+                               freelancer_id=freelancers[(i + j) % size].id,
+                               proposed_timeline_days=7))
+        db.session.add(Review(rating=5, comment="Great", project_id=project.id,
+                              reviewer_id=client.id, reviewee_id=freelancers[i].id))
+    for i, user in enumerate(freelancers):
+        db.session.add(Bid(amount=10 + i, proposal="Me too", project_id=busy.id,
+                           freelancer_id=user.id, proposed_timeline_days=i % 9 or None))
+    db.session.commit()
+
+    return Marketplace(
+        Account(client.id, client.email),
+        [Account(user.id, user.email) for user in freelancers],
+        [project.id for project in projects],
+        busy.id,
+    )
+
+
+@pytest.fixture
+def make_app():
+    """
+    Factory of (app, Marketplace) pairs: make_app(size, **config) creates
+    an app (TestConfig with `config` overrides) over a new in-memory
+    database seeded with seed_marketplace(size). No app context is left
+    pushed, so every request starts with an empty session.
+    """
+    def make(size=3, **config):
+        app = create_app(type("Config", (TestConfig,), config))
+        with app.app_context():
+            db.create_all()
+            return app, seed_marketplace(size)
+
+    return make
+
+
+@pytest.fixture
+def login():
+    """login(http, email) returns the Authorization headers of that user."""
+    def headers(http, email):
+        response = http.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+        return {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+
+    return headers
+
+
+@pytest.fixture
+def statements():
+    """
+    The (statement, parameters) of every SQL statement any engine executes
+    during the test; clear() it to start counting afresh.
+    """
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append((statement, parameters))
+
+    event.listen(Engine, "before_cursor_execute", record)
+    yield recorded
+    event.remove(Engine, "before_cursor_execute", record)
@@ -0,0 +1,33 @@
+# Tests for bulk bid ingestion: a freelancer can only place their own bids.
+
+
+def test_bulk_bids_are_placed_as_the_caller(make_app, login):
+    app, market = make_app()
+    http = app.test_client()
+    me, other = market.freelancers[0], market.freelancers[1]
+    p0, p1, p2 = market.projects
+
+    response = http.post("/api/bids/bulk", headers=login(http, me.email), json={"bids": [
+        {"project_id": p1, "amount": 70, "proposal": "Omitted"},
+        {"project_id": p2, "freelancer_id": None, "amount": 70, "proposal": "Null"},
+        {"project_id": market.busy_project, "freelancer_id": me.id, "amount": 70, "proposal": "Mine"},
+        {"project_id": p0, "freelancer_id": other.id, "amount": 70, "proposal": "Theirs"},
+    ]})
+    results = response.get_json()["results"]
+
+    assert ["id" in result for result in results[:2]] == [True, True]
+    # busy_project already has a bid from every freelancer
+    assert results[2]["errors"] == {"project_id": "You have already placed a bid on this project"}
+    assert results[3]["errors"] == {"freelancer_id": "You can only place your own bids"}
+    bidders = {bid["freelancer_id"] for bid in http.get(f"/api/project/{p2}/bids").get_json()}
+    assert bidders == {me.id}
+
+
+def test_bulk_bids_need_a_freelancer(make_app, login):
+    app, market = make_app()
+    http = app.test_client()
+    response = http.post("/api/bids/bulk", headers=login(http, market.client.email), json={"bids": [
+        {"project_id": market.projects[0], "freelancer_id": market.freelancers[0].id,
+         "amount": 70, "proposal": "Imported"},
+    ]})
+    assert response.status_code == 403
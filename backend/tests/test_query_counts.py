@@ -0,0 +1,37 @@
+# Query-count regression tests: a read route must load what it serializes
+# with a fixed number of queries, so the number of statements it issues
+# may not grow with the number of projects, bids and reviews (N+1).
+
+SIZES = (10, 100)
+
+
+def routes(market):
+    """(label, method, path, json) of every route whose count is checked."""
+    return [
+        ("GET /projects", "get", "/api/projects?limit=100", None),
+        ("GET /projects (full graph)", "get",
+         "/api/projects?limit=100&include=client,freelancer,bids,reviews", None),
+        ("GET /project/<id>", "get", f"/api/project/{market.busy_project}", None),
+        ("GET /project/<id>/bids", "get",
+         f"/api/project/{market.busy_project}/bids?limit=100", None),
+        ("GET /user/<id> (client)", "get", f"/api/user/{market.client.id}?limit=50", None),
+        ("GET /user/<id> (freelancer)", "get",
+         f"/api/user/{market.freelancers[0].id}?limit=50", None),
+        ("POST /rank_bids", "post", "/api/rank_bids", {"project_id": market.busy_project}),
+    ]
+
+
+def statement_counts(app, market, statements):
+    http = app.test_client()
+    counts = {}
+    for label, method, path, body in routes(market):
+        statements.clear()
+        response = getattr(http, method)(path, json=body)
+        assert response.status_code == 200, label
+        counts[label] = len(statements)
+    return counts
+
+
+def test_statement_counts_do_not_grow_with_the_data(make_app, statements):
+    small, large = (statement_counts(*make_app(size), statements) for size in SIZES)
+    assert large == small
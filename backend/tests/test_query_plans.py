@@ -0,0 +1,140 @@
+# Query-plan regression tests: the hot API routes are called through the
+# test client, every SELECT/UPDATE/DELETE they issue is run through EXPLAIN
+# QUERY PLAN, and a plan step that reads a whole table ("SCAN <table>",
+# with or without an index, or an automatic index) fails the test, so a new
+# query or a dropped index shows up before it reaches a large database.
+
+import re
+from datetime import datetime
+
+import pytest
+
+from app import db
+from app.pagination import encode_cursor
+
+# Plan steps that may scan a whole table on purpose (exact detail text)
+ALLOWED_SCANS = set()
+
+_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+def full_scans(plan_rows, table_names):
+    """
+    The plan details that read a whole table: any SCAN of a table (with or
+    without an index, which only saves the sort) and AUTOMATIC indexes
+    (SQLite builds them from a full scan on every query).
+    """
+    scans = []
+    for row in plan_rows:
+        detail = row[-1]
+        match = _SCAN.match(detail)
+        if (match and match.group(1) in table_names) or "AUTOMATIC" in detail:
+            scans.append(detail)
+    return scans
+
+
+def exercise(http, market, login):
+    """Calls the hot routes, yielding (route label, response) after each one."""
+    client = market.client
+    freelancer = market.freelancers[0]
+    p0, p1, p2 = market.projects
+
+    as_client = login(http, client.email)
+    yield "POST /auth/login", http.post(
+        "/api/auth/login", json={"email": freelancer.email, "password": "pw"}
+    )
+    as_freelancer = login(http, freelancer.email)
+
+    page = http.get("/api/projects?limit=1")
+    yield "GET /projects", page
+    yield "GET /projects (next page)", http.get(
+        "/api/projects", query_string={"limit": 1, "cursor": page.headers.get("X-Next-Cursor")}
+    )
+    yield "GET /projects (client, budget)", http.get(
+        "/api/projects", query_string={"client_id": client.id, "min_budget": 50, "max_budget": 500}
+    )
+    yield "GET /projects (skills)", http.get("/api/projects?skill=python&skill=sql&match=all")
+    yield "GET /projects/search", http.get("/api/projects/search?q=api")
+    yield "GET /project/<id>", http.get(f"/api/project/{p0}")
+    for sort in ("newest", "amount", "timeline"):
+        page = http.get(f"/api/project/{p0}/bids", query_string={"sort": sort, "limit": 1})
+        yield f"GET /project/<id>/bids ({sort})", page
+        yield f"GET /project/<id>/bids ({sort}, next page)", http.get(
+            f"/api/project/{p0}/bids",
+            query_string={"sort": sort, "limit": 1, "cursor": page.headers.get("X-Next-Cursor")}
+        )
+    yield "GET /projects/recommended", http.get("/api/projects/recommended", headers=as_freelancer)
+    yield "GET /project/<id>/candidates", http.get(f"/api/project/{p0}/candidates", headers=as_client)
+
+    yield "POST /project/<id>/bid", http.post(
+        f"/api/project/{p2}/bid", headers=as_freelancer,
+        json={"amount": 80, "proposal": "Hello", "proposed_timeline_days": 3}
+    )
+    yield "POST /rank_bids", http.post("/api/rank_bids", json={"project_id": p0, "limit": 5})
+    yield "POST /rank_bids/batch", http.post(
+        "/api/rank_bids/batch", json={"projects": [{"project_id": p0}, {"project_id": p1}]}
+    )
+    yield "DELETE /project/<id>/bid", http.delete(f"/api/project/{p2}/bid", headers=as_freelancer)
+    yield "POST /projects/bulk", http.post("/api/projects/bulk", headers=as_client, json={"projects": [
+        {"title": "Bulk project", "description": "Imported", "budget": 200, "required_skills": "python"},
+    ]})
+    yield "POST /bids/bulk", http.post("/api/bids/bulk", headers=as_freelancer, json={"bids": [
+        {"project_id": p2, "amount": 70, "proposal": "Bulk bid"},
+        {"project_id": p1, "amount": 70, "proposal": "Bulk bid"},
+    ]})
+    yield "PUT /user/profile", http.put(
+        "/api/user/profile", headers=as_freelancer, json={"skills": "python, go"}
+    )
+
+    bid_id = http.get(f"/api/project/{p0}").get_json()["bids"][0]["id"]
+    yield "POST /project/<id>/accept_bid", http.post(
+        f"/api/project/{p0}/accept_bid", headers=as_client, json={"bid_id": bid_id}
+    )
+    yield "GET /user/my-accepted-projects", http.get(
+        "/api/user/my-accepted-projects", headers=as_freelancer
+    )
+    yield "GET /user/<id> (client)", http.get(f"/api/user/{client.id}")
+    yield "GET /user/<id> (freelancer)", http.get(f"/api/user/{freelancer.id}")
+    yield "GET /user/profile", http.get("/api/user/profile", headers=as_freelancer)
+
+    page = http.get(f"/api/user/{client.id}/projects?limit=1")
+    yield "GET /user/<id>/projects", page
+    yield "GET /user/<id>/projects (next page)", http.get(
+        f"/api/user/{client.id}/projects",
+        query_string={"limit": 1, "cursor": page.headers.get("X-Next-Cursor")}
+    )
+    yield "GET /user/<id>/reviews (next page)", http.get(
+        f"/api/user/{freelancer.id}/reviews",
+        query_string={"cursor": encode_cursor(datetime.utcnow(), 0)}
+    )
+
+
+@pytest.mark.parametrize("skill_match_mode", ["jaccard", "idf"])
+def test_hot_route_queries_use_indexes(make_app, statements, login, skill_match_mode):
+    app, market = make_app(SKILL_MATCH_MODE=skill_match_mode)
+    http = app.test_client()
+
+    route_statements = []
+    statements.clear()
+    for label, response in exercise(http, market, login):
+        assert response.status_code < 400, f"{label} returned {response.status_code}"
+        route_statements.append((label, [
+            (statement, parameters) for statement, parameters in statements
+            if statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "UPDATE", "DELETE")
+        ]))
+        statements.clear()
+
+    failures, seen = [], set()
+    with app.app_context(), db.engine.connect() as conn:
+        table_names = set(db.metadata.tables)
+        for label, captured in route_statements:
+            for statement, parameters in captured:
+                if statement in seen:
+                    continue
+                seen.add(statement)
+                plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+                failures += [
+                    f"{label}: {scan} in {' '.join(statement.split())[:160]}"
+                    for scan in full_scans(plan, table_names) if scan not in ALLOWED_SCANS
+                ]
+    assert not failures, "\n".join(failures)
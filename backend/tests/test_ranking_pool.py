@@ -0,0 +1,59 @@
+# Parity tests for process-pool ranking: the features computed in the pool
+# must be exactly the in-process ones, for indexed and not yet indexed
+# projects and bidders under every skill match mode.
+
+import math
+import random
+
+import pytest
+
+from app.ranking_data import BidRow, FreelancerRow, ProjectRow
+from app.ranking_logic import compute_features_for_bid
+from app.ranking_pool import collect_bid_features_parallel
+
+N_BIDS = 200
+
+
+def synthetic_inputs(project_indexed, n_bids, seed=7):
+    """
+    One project and `n_bids` bids whose bidders mix indexed, not yet
+    indexed and skill-less rows, as plain rows.
+    """
+    rnd = random.Random(seed)
+    vocab = [f"skill{i}" for i in range(1, 21)]
+
+    def skills(ids, indexed):
+        csv = ", ".join(vocab[i - 1] for i in ids)
+        if not indexed:
+            return csv, None, None
+        if rnd.random() < 0.3:
+            return csv, sum(1 << i for i in ids), None  # indexed without vectors (jaccard mode)
+        norm = math.sqrt(len(ids)) or 1.0
+        return csv, sum(1 << i for i in ids), {i: 1 / norm for i in ids}
+
+    project = ProjectRow(1, "Parity check", *skills(rnd.sample(range(1, 21), 4), project_indexed))
+    bids, freelancers = [], {}
+    for i in range(1, n_bids + 1):
+        ids = rnd.sample(range(1, 21), rnd.randint(0, 5))
+        freelancers[i] = FreelancerRow(
+            i, f"freelancer{i}", round(rnd.uniform(0, 5), 2), rnd.random(), rnd.random(),
+            rnd.random(), *skills(ids, indexed=rnd.random() < 0.7)
+        )
+        bids.append(BidRow(i, float(rnd.randint(50, 5000)), None,
+                           rnd.choice([None, 3, 14, 60]), i, project.id))
+    return project, bids, freelancers
+
+
+@pytest.mark.parametrize("skill_mode", ["jaccard", "idf"])
+@pytest.mark.parametrize("project_indexed", [True, False], ids=["indexed", "unindexed"])
+def test_pooled_features_match_in_process(project_indexed, skill_mode):
+    project, bids, freelancers = synthetic_inputs(project_indexed, N_BIDS)
+    expected = [
+        compute_features_for_bid(bid, freelancers[bid.freelancer_id], project, skill_mode)
+        for bid in bids
+    ]
+    pooled = collect_bid_features_parallel(
+        project, bids, freelancers, skill_mode, workers=2, chunk_size=N_BIDS // 4
+    )
+    assert [b["bid"].id for b in pooled] == [bid.id for bid in bids]
+    assert [b["features"] for b in pooled] == expected